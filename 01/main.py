@@ -1,7 +1,6 @@
 from typing import List
 
-from rich import print
-
+from utils.out import print
 from utils.readers import FileReader
 
 
@@ -23,31 +22,27 @@ class OneColumnFileReaderSpaceAware(FileReader):
     [[1, 2, 3], [[5, 6 ,7]]
     """
 
+    streaming = True
+
     def read(self, *args) -> List[List]:
         """
         Implementation of a one column space aware data file read function
         """
-        data = super(OneColumnFileReaderSpaceAware, self).read()
-        split_data = data.splitlines()
-
-        indexes = [i for i, x in enumerate(split_data) if not x]
-
         result = []
-        for start, end in zip([0, *indexes], [*indexes, len(split_data)]):
-            chunk = [line for line in split_data[start : end + 1] if line]
-            chunk = list(map(int, chunk))
-            result.append(chunk)
+        chunk = []
+        for line in self.lines():
+            if not line:
+                result.append(chunk)
+                chunk = []
+                continue
+            chunk.append(int(line))
+        result.append(chunk)
 
         return result
 
 
-test_reader = OneColumnFileReaderSpaceAware("input-test.txt")
-test_data = test_reader.read()
-
-reader = OneColumnFileReaderSpaceAware("input.txt")
-prod_data = reader.read()
-
-data_sources = (("Test data", test_data), ("Prod data", prod_data))
+def parse(file: str) -> List[List[int]]:
+    return OneColumnFileReaderSpaceAware(file).cached_read()
 
 
 def combine_calories(data: List[List[int]]) -> List[int]:
@@ -70,10 +65,24 @@ def top_three_combined(data: List[int]) -> int:
     return sum(data[0:3])
 
 
-for data_source_name, data_source in data_sources:
-    print(
-        f"Day 1 - Result 1 - {data_source_name}: {max(combine_calories(data_source))}"
-    )
-    print(
-        f"Day 1 - Result 2 - {data_source_name}: {top_three_combined(combine_calories(data_source))}"
-    )
+def part1(data: List[List[int]]) -> int:
+    return max(combine_calories(data))
+
+
+def part2(data: List[List[int]]) -> int:
+    return top_three_combined(combine_calories(data))
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (("Test data", test_data), ("Prod data", prod_data))
+
+    for data_source_name, data_source in data_sources:
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {part2(data_source)}")
+
+
+if __name__ == "__main__":
+    main()
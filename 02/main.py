@@ -4,9 +4,13 @@ Could probably be way more smart about this, but bruteforce copy paste it is
 from enum import Enum
 from typing import List
 
-from rich import print
+import numpy as np
 
-from utils.readers import OneColumnFileReader
+from utils.out import TRACE, is_enabled, print
+from utils.readers import FileReader
+
+FIRST_COLUMN = "ABC"
+SECOND_COLUMN = "XYZ"
 
 
 class MoveEnum(Enum):
@@ -39,45 +43,74 @@ def to_result(result:str) -> ResultEnum:
         return ResultEnum.WIN
 
 
-class StrategyGuideReader(OneColumnFileReader):
+class StrategyGuideReader(FileReader):
     """
-    Implementation of a rock paper scissors strategy
+    Implementation of a rock paper scissors strategy, counting each possible round
 
     E.g.
 
     A Y
     B X
     C Z
+    A Y
 
     ->
-    [[R, P], [P, R], [S S]]
+    [[0, 2, 0], [1, 0, 0], [0, 0, 1]]
     """
 
-    def read(self, *args) -> List[List]:
+    def count_rounds(self, chunk: bytes) -> np.ndarray:
         """
-        Implementation of a one column space aware data file read function
+        Given whole lines of the strategy guide, return the number of rounds of each
+        opponent move and second column pair, flattened, counted in a single pass.
+        Raise a ValueError if a non empty line is not a round.
         """
-        data = super(StrategyGuideReader, self).read()
-        result = []
-        for line in data:
-            opponent, me = line.split(" ")
-            opponent = to_move(opponent)
-            me = to_result(me)
-            result.append([opponent, me])
-
-        return result
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        opponents = np.flatnonzero((data >= ord("A")) & (data <= ord("C")))
+        mes = opponents + 2
+        valid = (
+            # Every non blank byte belongs to a round
+            np.count_nonzero(~np.isin(data, list(b" \t\r\n"))) == 2 * len(opponents)
+            and (mes < len(data)).all()
+        )
+        if valid and len(opponents):
+            before = data[np.maximum(opponents - 1, 0)]
+            after = data[np.minimum(mes + 1, len(data) - 1)]
+            valid = bool(
+                ((data[mes] >= ord("X")) & (data[mes] <= ord("Z"))).all()
+                and (data[opponents + 1] == ord(" ")).all()
+                and ((opponents == 0) | (before == ord("\n"))).all()
+                and ((mes == len(data) - 1) | np.isin(after, list(b"\r\n"))).all()
+            )
+        if not valid:
+            raise ValueError(f"Malformed strategy guide {self.file}")
+
+        return np.bincount(
+            (data[opponents] - ord("A")) * len(SECOND_COLUMN) + data[mes] - ord("X"),
+            minlength=len(FIRST_COLUMN) * len(SECOND_COLUMN),
+        )
+
+    def read(self, *args) -> List[List[int]]:
+        """
+        Implementation of a strategy guide read function, returning the number of
+        rounds of each opponent move (rows) and second column (columns) pair.
 
+        Rounds are counted straight from the raw bytes, chunks being cut after their
+        last line ending so that no round is split.
+        """
+        counts = np.zeros(len(FIRST_COLUMN) * len(SECOND_COLUMN), dtype=np.int64)
+        remainder = b""
+        for chunk in self.iter_chunks():
+            chunk = remainder + chunk
+            end = chunk.rfind(b"\n") + 1
+            chunk, remainder = chunk[:end], chunk[end:]
+            counts += self.count_rounds(chunk)
+        counts += self.count_rounds(remainder)
 
-test_reader = StrategyGuideReader("input-test.txt")
-test_data = test_reader.read()
+        return counts.reshape(len(FIRST_COLUMN), -1).tolist()
 
-reader = StrategyGuideReader("input.txt")
-prod_data = reader.read()
 
-data_sources = (
-    ("Test data", test_data),
-    ("Prod data", prod_data)
-)
+def parse(file: str) -> List[List[int]]:
+    return StrategyGuideReader(file).cached_read()
 
 
 def compute_move_score(opponent: MoveEnum, me: MoveEnum) -> int:
@@ -142,27 +175,80 @@ def find_move_from_result(opponent: MoveEnum, me: ResultEnum):
                     return MoveEnum.ROCK
 
 
-def compute_scores(data: List[List]) -> int:
+# Score of each opponent move (rows) and second column (columns) pair, when the second
+# column is my move
+MOVE_SCORES = [
+    [compute_move_score(to_move(opponent), to_move(me)) for me in SECOND_COLUMN]
+    for opponent in FIRST_COLUMN
+]
+
+# Score of each opponent move (rows) and second column (columns) pair, when the second
+# column is the round result
+RESULT_SCORES = [
+    [
+        compute_move_score(
+            to_move(opponent), find_move_from_result(to_move(opponent), to_result(me))
+        )
+        for me in SECOND_COLUMN
+    ]
+    for opponent in FIRST_COLUMN
+]
+
+
+def compute_total(counts: List[List[int]], scores: List[List[int]]) -> int:
     """
-    Given a list of opponent moves and results, compute the final score.
+    Given the number of each possible round and their scores, compute the final score.
     """
     total_score = 0
-    for move in data:
-        opponent_move = move[0]
-        result = move[1]
-        my_move = find_move_from_result(opponent_move, result)
-        score = compute_move_score(opponent_move, my_move)
+    for opponent, row in enumerate(counts):
+        for me, count in enumerate(row):
+            if not count:
+                continue
+            score = scores[opponent][me]
+            if is_enabled(TRACE):
+                print(
+                    f"Op: {FIRST_COLUMN[opponent]}, me:{SECOND_COLUMN[me]} "
+                    f"-> score {score} x {count}",
+                    level=TRACE,
+                )
+            total_score += score * count
+    return total_score
 
-        print(f"Op: {opponent_move}, res:{result}, me:{my_move} -> score {score}")
 
-        total_score += score
-    return total_score
+def compute_move_scores(data: List[List[int]]) -> int:
+    """
+    Given the number of each possible round, compute the final score, the second
+    column being my move.
+    """
+    return compute_total(data, MOVE_SCORES)
+
+
+def compute_scores(data: List[List[int]]) -> int:
+    """
+    Given the number of each possible round, compute the final score, the second
+    column being the round result.
+    """
+    return compute_total(data, RESULT_SCORES)
+
+
+def part1(data: List[List[int]]) -> int:
+    return compute_move_scores(data)
+
+
+def part2(data: List[List[int]]) -> int:
+    return compute_scores(data)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (("Test data", test_data), ("Prod data", prod_data))
+
+    for data_source_name, data_source in data_sources:
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {part2(data_source)}")
 
-for data_source_name, data_source in data_sources:
-    # print(
-    #     f"Day 1 - Result 1 - {data_source_name}: {compute_scores(data_source)}"
-    # )
-    print(
-        f"Day 1 - Result 2 - {data_source_name}: {compute_scores(data_source)}"
-    )
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+from main import StrategyGuideReader
+
+
+def read(content: str, chunk_size: int = 1 << 20):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(content)
+    try:
+        reader = StrategyGuideReader(f.name)
+        reader.chunk_size = chunk_size
+        return reader.read()
+    finally:
+        os.remove(f.name)
+
+
+class TestStrategyGuideReader(unittest.TestCase):
+    def test_counts(self):
+        content = "A Y\nB X\nC Z\nA Y\n\nB Z\r\nC X"
+        expected = [[0, 2, 0], [1, 0, 1], [1, 0, 1]]
+        for chunk_size in (1, 3, 5, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(read(content, chunk_size), expected)
+
+    def test_malformed(self):
+        for content in ("A Y\nB W\n", "A Y\nBX\n", "A Y C Z\n", "A\n", "A Y\nD X\n"):
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    read(content)
+
+
+if __name__ == "__main__":
+    unittest.main()
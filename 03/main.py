@@ -1,10 +1,20 @@
-from copy import copy
-from typing import List
+import string
+from typing import List, Tuple
 
-from rich import print
+import numpy as np
 
+from utils.out import TRACE, is_enabled, print
 from utils.readers import OneColumnFileReader
 
+# Items ordered by priority, priority 0 being no item
+ITEMS = " " + string.ascii_lowercase + string.ascii_uppercase
+
+# Priority of each byte, 0 for bytes that are not items
+PRIO_TABLE = np.zeros(256, dtype=np.uint64)
+PRIO_TABLE[np.frombuffer(ITEMS[1:].encode("ascii"), dtype=np.uint8)] = np.arange(
+    1, len(ITEMS), dtype=np.uint64
+)
+
 
 class RucksackReader(OneColumnFileReader):
     """
@@ -33,49 +43,67 @@ class RucksackReader(OneColumnFileReader):
         return result
 
 
-test_reader = RucksackReader("input-test.txt")
-test_data = test_reader.read()
-
-reader = RucksackReader("input.txt")
-prod_data = reader.read()
-
-data_sources = (("Test data", test_data), ("Prod data", prod_data))
+def parse(file: str) -> List[List[str]]:
+    return RucksackReader(file).cached_read()
 
 
-def find_common_letter_in_rucksack(left: str, right: str) -> str:
+def compute_masks(rucksacks: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Given two strings, return the common letter.
+    Given a list of rucksacks, return the priority masks of their left and right
+    compartments, computed at once for all rucksacks.
     """
-    for letter in left:
-        if letter in right:
-            return letter
+    halves = [half for rucksack in rucksacks for half in rucksack]
+    lengths = np.fromiter(map(len, halves), dtype=np.int64, count=len(halves))
+    items = np.frombuffer("".join(halves).encode("ascii"), dtype=np.uint8)
+    bits = np.left_shift(np.uint64(1), PRIO_TABLE[items])
+
+    starts = np.zeros(len(halves), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    masks = np.zeros(len(halves), dtype=np.uint64)
+    if len(items):
+        # reduceat cannot start at the end of the array, nor reduce empty segments
+        filled = lengths > 0
+        masks[filled] = np.bitwise_or.reduceat(bits, starts[filled])
+    return masks[0::2], masks[1::2]
+
+
+def masks_to_prio(masks: np.ndarray) -> np.ndarray:
+    """
+    Given priority masks, return their highest priority, 0 for empty masks.
 
-    raise Exception(f"Could not find common letter in {left} & {right}")
+    Masks are at most 53 bits long, so they are exactly represented as floats.
+    """
+    return np.where(masks > 0, np.frexp(masks.astype(np.float64))[1] - 1, 0)
 
 
-def compute_prio(letter: str) -> int:
+def check_common(masks: np.ndarray, groups: List) -> None:
     """
-    Given an item, compute the associated priority
+    Given common item masks and their groups, raise if a group has no common item
     """
-    if letter.islower():
-        return ord(letter) - 96
-    return ord(letter) - 64 + 26
+    missing = np.flatnonzero(masks == 0)
+    if len(missing):
+        raise Exception(f"Could not find common letter in {groups[missing[0]]}")
 
 
 def compute_all_prio(rucksacks: List[List[str]]) -> int:
     """
     Given a list of rucksacks, compute the sum of all rucksack priority
     """
-    result = 0
-    for rucksack in rucksacks:
-        common_letter = find_common_letter_in_rucksack(*rucksack)
-        prio = compute_prio(common_letter)
-        result += prio
-        print(
-            f"rucksack : {rucksack}, CL: {common_letter}, prio: {prio}, res: {result}"
-        )
+    left, right = compute_masks(rucksacks)
+    common = left & right
+    check_common(common, rucksacks)
+    prios = masks_to_prio(common)
+    results = np.cumsum(prios)
 
-    return result
+    if is_enabled(TRACE):
+        for rucksack, prio, result in zip(rucksacks, prios.tolist(), results.tolist()):
+            common_letter = ITEMS[prio]
+            print(
+                f"rucksack : {rucksack}, CL: {common_letter}, prio: {prio}, res: {result}",
+                level=TRACE,
+            )
+
+    return int(results[-1]) if len(results) else 0
 
 
 def chunks(lst, n):
@@ -85,40 +113,51 @@ def chunks(lst, n):
     return [lst[i : i + n] for i in range(0, len(lst), n)]
 
 
-def find_common_letter_in_multiple_rucksack(rucksacks: List[List[str]]) -> str:
+def compute_badge_prio(rucksacks: List[List[str]], group_size: int = 3) -> int:
     """
-    Given a list of rucksacks, find the common item
+    Given a list of rucksacks, device them in groups of group_size, find the common
+    items in all rucksack groups and sum them.
     """
-    rucksacks_merged = [rucksack[0] + rucksack[1] for rucksack in rucksacks]
-    for rucksack in rucksacks_merged:
-        rucksacks_to_compare = copy(rucksacks_merged)
-        rucksacks_to_compare.remove(rucksack)
-        for letter in rucksack:
-            found = len(
-                list(filter(lambda x: letter in x, rucksacks_to_compare))
-            ) == len(rucksacks_to_compare)
-            if found:
-                return letter
+    if not rucksacks:
+        return 0
 
-    raise Exception()
+    left, right = compute_masks(rucksacks)
+    starts = np.arange(0, len(rucksacks), group_size)
+    common = np.bitwise_and.reduceat(left | right, starts)
+    groups = chunks(rucksacks, group_size)
+    check_common(common, groups)
+    prios = masks_to_prio(common)
+    results = np.cumsum(prios)
 
+    if is_enabled(TRACE):
+        for group, prio, result in zip(groups, prios.tolist(), results.tolist()):
+            common_letter = ITEMS[prio]
+            print(
+                f"rucksack : {group}, CL: {common_letter}, prio: {prio}, res: {result}",
+                level=TRACE,
+            )
 
-def compute_badge_prio(rucksacks: List[List[str]]) -> int:
-    """
-    Given a list of rucksacks, device them in groups of three, find the common items in
-    all rucksack groups and sum them.
-    """
-    groups = chunks(rucksacks, 3)
-    result = 0
-    for group in groups:
-        common_letter = find_common_letter_in_multiple_rucksack(group)
-        prio = compute_prio(common_letter)
-        result += prio
-        print(f"rucksack : {group}, CL: {common_letter}, prio: {prio}, res: {result}")
+    return int(results[-1])
+
+
+def part1(data: List[List[str]]) -> int:
+    return compute_all_prio(data)
+
+
+def part2(data: List[List[str]]) -> int:
+    return compute_badge_prio(data)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (("Test data", test_data), ("Prod data", prod_data))
 
-    return result
+    for data_source_name, data_source in data_sources:
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {part2(data_source)}")
 
 
-for data_source_name, data_source in data_sources:
-    print(f"Day 1 - Result 1 - {data_source_name}: {compute_all_prio(data_source)}")
-    print(f"Day 1 - Result 2 - {data_source_name}: {compute_badge_prio(data_source)}")
+if __name__ == "__main__":
+    main()
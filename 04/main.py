@@ -1,20 +1,20 @@
-from typing import List, Set
+import re
 
-from utils.out import print
-from utils.readers import OneColumnFileReader
+import numpy as np
 
+from utils.out import print
+from utils.readers import FileReader
 
-def range_to_set(data: str):
-    """
-    Convert a vlan like range to an int set
+# Columns of an assignment pair row
+LEFT_LOW, LEFT_HIGH, RIGHT_LOW, RIGHT_HIGH = range(4)
 
-    2-4 -> set(2, 3, 4)
-    """
-    min, max = map(int, data.split("-"))
-    return set(range(min, max + 1))
+# Lines of at most one assignment pair each, blank lines and spaces aside
+ASSIGNMENTS_REGEX = re.compile(
+    r"(?:[^\S\n]*(?:\d+-\d+,\d+-\d+)?[^\S\n]*\n)*[^\S\n]*(?:\d+-\d+,\d+-\d+)?\s*"
+)
 
 
-class AssignmentReader(OneColumnFileReader):
+class AssignmentReader(FileReader):
     """
     Implementation of an assignment pair
 
@@ -24,75 +24,100 @@ class AssignmentReader(OneColumnFileReader):
     2-3,4-5
 
     ->
-    [[(2, 3, 4), (6, 7, 8)], [(2, 3), (4, 5)]]
+    [[2, 4, 6, 8], [2, 3, 4, 5]]
     """
 
-    def read(self, *args) -> List[List[Set[int]]]:
+    def read(self, *args) -> np.ndarray:
         """
-        Implementation of a one column assignment pair file read function
+        Implementation of a one column assignment pair file read function, returning
+        one (left low, left high, right low, right high) row per pair
         """
-        data = super(AssignmentReader, self).read()
-        result = []
-        for line in data:
-            left, right = line.split(",")
-            assignment = [range_to_set(left), range_to_set(right)]
-            result.append(assignment)
+        with open(self.file, encoding=self.encoding) as f:
+            data = f.read()
+        if ASSIGNMENTS_REGEX.fullmatch(data) is None:
+            raise ValueError(f"Malformed assignment pairs in {self.file}")
+        data = data.translate(str.maketrans("-,", "  "))
+        return np.fromstring(data, dtype=np.int64, sep=" ").reshape(-1, 4)
 
-        return result
 
+def parse(file: str) -> np.ndarray:
+    return AssignmentReader(file).cached_read()
 
-test_reader = AssignmentReader("input-test.txt")
-test_data = test_reader.read()
 
-reader = AssignmentReader("input.txt")
-prod_data = reader.read()
-
-data_sources = (("Test data", test_data), ("Prod data", prod_data))
+def check_for_fully_contains_sets(data: np.ndarray) -> int:
+    """
+    Given a list of pair assignment, check the number of pair where an assignment is
+    the subset of the other
+    """
+    left_in_right = (data[:, LEFT_LOW] >= data[:, RIGHT_LOW]) & (
+        data[:, LEFT_HIGH] <= data[:, RIGHT_HIGH]
+    )
+    right_in_left = (data[:, RIGHT_LOW] >= data[:, LEFT_LOW]) & (
+        data[:, RIGHT_HIGH] <= data[:, LEFT_HIGH]
+    )
+    return int(np.count_nonzero(left_in_right | right_in_left))
 
 
-def check_for_fully_contains_set(left: Set[int], right: Set[int]):
+def intersecting(data: np.ndarray) -> np.ndarray:
     """
-    Given two sets, check if any of them is a subset of the other
+    Given a list of pair assignment, return whether each pair is intersecting
     """
-    return left.issubset(right) or right.issubset(left)
+    return (data[:, LEFT_LOW] <= data[:, RIGHT_HIGH]) & (
+        data[:, RIGHT_LOW] <= data[:, LEFT_HIGH]
+    )
 
 
-def check_for_fully_contains_sets(data: List[List[Set[int]]]) -> int:
+def check_for_intersection_sets(data: np.ndarray) -> int:
     """
-    Given a list of pair assignment, check the number of pair where an assignment is
-    the subset of the other
+    Given a list of pair assignment, check the number of pair assignments are intersecting
     """
-    result = 0
-    for pair in data:
-        if check_for_fully_contains_set(*pair):
-            result += 1
-
-    return result
+    return int(np.count_nonzero(intersecting(data)))
 
 
-def check_for_intersection_set(left: Set[int], right: Set[int]):
+def count_overlaps(lows: np.ndarray, highs: np.ndarray) -> np.ndarray:
     """
-    Given two sets, check is they are intersecting
+    Given intervals, return the number of other intervals each one of them overlaps.
+
+    An interval overlaps all the intervals starting before its end, except the ones
+    ending before its start, which are found by binary search in the sorted bounds.
     """
-    return left.intersection(right)
+    starting = np.searchsorted(np.sort(lows), highs, side="right")
+    ending = np.searchsorted(np.sort(highs), lows, side="left")
+    return starting - ending - 1
 
 
-def check_for_intersection_sets(data: List[List[Set[int]]]) -> int:
+def count_pairs_overlapping_others(data: np.ndarray) -> int:
     """
-    Given a list of pair assignment, check the number of pair assignments are intersecting
+    Given a list of pair assignment, check the number of pairs with an assignment
+    overlapping an assignment of another pair
     """
-    result = 0
-    for pair in data:
-        if check_for_intersection_set(*pair):
-            result += 1
+    lows = np.concatenate((data[:, LEFT_LOW], data[:, RIGHT_LOW]))
+    highs = np.concatenate((data[:, LEFT_HIGH], data[:, RIGHT_HIGH]))
+    overlaps = count_overlaps(lows, highs).reshape(2, -1)
 
-    return result
+    # Each assignment of an intersecting pair overlaps its partner
+    others = overlaps - intersecting(data)
+    return int(np.count_nonzero((others > 0).any(axis=0)))
 
 
-for data_source_name, data_source in data_sources:
-    print(
-        f"Day 1 - Result 1 - {data_source_name}: {check_for_fully_contains_sets(data_source)}"
-    )
-    print(
-        f"Day 1 - Result 2 - {data_source_name}: {check_for_intersection_sets(data_source)}"
-    )
+def part1(data: np.ndarray) -> int:
+    return check_for_fully_contains_sets(data)
+
+
+def part2(data: np.ndarray) -> int:
+    return check_for_intersection_sets(data)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (("Test data", test_data), ("Prod data", prod_data))
+
+    for data_source_name, data_source in data_sources:
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {part2(data_source)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+from main import (
+    AssignmentReader,
+    check_for_fully_contains_sets,
+    check_for_intersection_sets,
+    count_pairs_overlapping_others,
+)
+
+
+def random_pairs(rng: random.Random, count: int, span: int) -> np.ndarray:
+    rows = []
+    for _ in range(count):
+        row = []
+        for _ in range(2):
+            low = rng.randint(1, span)
+            row += [low, rng.randint(low, span)]
+        rows.append(row)
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def read(content: str) -> np.ndarray:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(content)
+    try:
+        return AssignmentReader(f.name).read()
+    finally:
+        os.remove(f.name)
+
+
+def overlapping(left, right) -> bool:
+    return left[0] <= right[1] and right[0] <= left[1]
+
+
+class TestAssignments(unittest.TestCase):
+    def test_counts(self):
+        rng = random.Random(4)
+        for count, span in ((0, 10), (1, 10), (2, 5), (50, 20), (300, 1000)):
+            with self.subTest(count=count, span=span):
+                data = random_pairs(rng, count, span)
+                pairs = [((a, b), (c, d)) for a, b, c, d in data.tolist()]
+
+                expected = sum(
+                    any(
+                        overlapping(assignment, other)
+                        for j, other_pair in enumerate(pairs)
+                        if j != i
+                        for other in other_pair
+                        for assignment in pair
+                    )
+                    for i, pair in enumerate(pairs)
+                )
+                self.assertEqual(count_pairs_overlapping_others(data), expected)
+
+                contains = sum(
+                    (l[0] >= r[0] and l[1] <= r[1]) or (r[0] >= l[0] and r[1] <= l[1])
+                    for l, r in pairs
+                )
+                self.assertEqual(check_for_fully_contains_sets(data), contains)
+                intersections = sum(overlapping(l, r) for l, r in pairs)
+                self.assertEqual(check_for_intersection_sets(data), intersections)
+
+    def test_read(self):
+        for content in ("2-4,6-8\n2-3,4-5", "2-4,6-8\r\n\n2-3,4-5\n\n"):
+            with self.subTest(content=content):
+                self.assertEqual(read(content).tolist(), [[2, 4, 6, 8], [2, 3, 4, 5]])
+        self.assertEqual(read("").shape, (0, 4))
+
+    def test_malformed(self):
+        for content in (
+            "1-2,3-4-5-6\n7-8\n",
+            "1-2,3-4 5-6,7-8\n",
+            "1-2,3\n",
+            "1-2,3-x\n",
+            "1-2;3-4\n",
+        ):
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    read(content)
+
+
+if __name__ == "__main__":
+    unittest.main()
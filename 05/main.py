@@ -1,16 +1,14 @@
 import re
-from collections import deque
-from copy import deepcopy
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 
-from utils.out import print
+from utils.out import DEBUG, TRACE, is_enabled, print
 from utils.readers import FileReader
 
 INSTRUCTION_REGEX = re.compile(r"move (\d+) from (\d+) to (\d+)")
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     number: int
     origin: int
@@ -34,43 +32,35 @@ class CraneStackReader(FileReader):
     move 1 from 1 to 2
     """
 
-    def read_stack(self, raw_stack: List[str]) -> Dict[int, deque]:
+    def read_stack(self, raw_stack: List[str]) -> Dict[int, List[str]]:
         """
-        Given a raw stack, return a modelized stack
+        Given a raw stack, return a modelized stack, each stack being listed from
+        bottom to top
         """
-        index_line = raw_stack[-1]
-        index_to_col_map = {}
-        stacks = {}
+        labels = [int(label) for label in raw_stack[-1].split()]
+        width = len(labels)
 
-        for index, char in enumerate(index_line):
-            if char != " ":
-                index_to_col_map[index] = int(char)
-                stacks[int(char)] = deque()
+        # The crate of the nth stack is at offset 1 + 4 * n of each drawing line
+        levels = [line[1::4].ljust(width) for line in reversed(raw_stack[:-1])]
+        assert all(len(level) == width for level in levels), "Unlabelled stack"
 
-        for line in raw_stack[:-1]:
-            for char_index, char in enumerate(line):
-                if char not in ["[", "]", " ", ""]:
-                    stack_index = index_to_col_map.get(char_index)
-                    assert stack_index is not None
-                    stacks[stack_index].append(char)
-
-        return stacks
+        return {
+            label: list("".join(column).rstrip())
+            for label, column in zip(labels, zip(*levels))
+        }
 
     def read_instructions(self, raw_instructions: List[str]) -> List[Instruction]:
         """
         Given a list of raw instructions, return a list of instructions
         """
-        instructions = []
-        for line in raw_instructions:
-            number, origin, destination = INSTRUCTION_REGEX.match(line).groups()
-            instruction = Instruction(
-                number=int(number), origin=int(origin), destination=int(destination)
+        return [
+            Instruction(number=int(number), origin=int(origin), destination=int(dest))
+            for number, origin, dest in INSTRUCTION_REGEX.findall(
+                "\n".join(raw_instructions)
             )
-            instructions.append(instruction)
-
-        return instructions
+        ]
 
-    def read(self, *args) -> Tuple[Dict[int, deque], List[Instruction]]:
+    def read(self, *args) -> Tuple[Dict[int, List[str]], List[Instruction]]:
         """
         Implementation of a combined crane stack and insturction file reader.
         """
@@ -85,19 +75,11 @@ class CraneStackReader(FileReader):
         return stack, instructions
 
 
-test_reader = CraneStackReader("input-test.txt")
-test_data = test_reader.read()
-
-reader = CraneStackReader("input.txt")
-prod_data = reader.read()
+def parse(file: str) -> Tuple[Dict[int, List[str]], List[Instruction]]:
+    return CraneStackReader(file).cached_read()
 
-data_sources = (
-    ("Test data", test_data),
-    ("Prod data", prod_data),
-)
 
-
-def display_stack(stack: Dict[int, deque]) -> str:
+def display_stack(stack: Dict[int, List[str]]) -> str:
     """
     Given a stack, display it.
     E.g.
@@ -109,57 +91,157 @@ def display_stack(stack: Dict[int, deque]) -> str:
 
     Warning: Order is the same as shown on AOC, just packed from above instead of bellow
     """
-    all_empty = all(map(lambda x: not len(x), stack.values()))
-    lines = [" " + "".join(map(str, sorted(stack.keys())))]
-    while not all_empty:
-        line = " " * len(stack)
-        for index in sorted(stack.keys()):
-            if len(stack[index]):
-                line = line[:index] + f"{stack[index].popleft()}" + line[index + 1 :]
-        lines.append(line)
-        all_empty = all(map(lambda x: not len(x), stack.values()))
+    indexes = sorted(stack.keys())
+    lines = [" " + "".join(map(str, indexes))]
+    height = max(map(len, stack.values()), default=0)
+    for level in range(1, height + 1):
+        line = " " + "".join(
+            stack[index][-level] if len(stack[index]) >= level else " "
+            for index in indexes
+        )
+        lines.append(line[:-1] if line.endswith(" ") else line)
 
     return "\n".join(lines)
 
 
-def run(stack: Dict[int, deque], instructions: List[Instruction]):
+def operate(
+    stack: Dict[int, List[str]], instructions: List[Instruction], keep_order: bool
+) -> Dict[int, List[str]]:
     """
-    Given a stack and instructions, run the process for step 1
+    Given a stack and instructions, return the stack once the instructions are run,
+    crates moved at once keeping their order if keep_order, one by one otherwise.
+    Crates moved onto their own stack end up where they were.
+
+    The given stack is left untouched.
     """
+    stack = {index: crates.copy() for index, crates in stack.items()}
+    trace = is_enabled(TRACE)
     for index, instruction in enumerate(instructions):
-        print(f"index {index} {instruction}")
-        for _ in range(instruction.number):
-            value = stack[instruction.origin].popleft()
-            stack[instruction.destination].appendleft(value)
-        print(f"index {index}\n{display_stack(deepcopy(stack))}\n#######\n")
+        if trace:
+            print(f"index {index} {instruction}", level=TRACE)
+        if instruction.origin == instruction.destination:
+            continue
+        origin = stack[instruction.origin]
+        assert instruction.number <= len(origin), f"Not enough crates for {instruction}"
+        moved = origin[len(origin) - instruction.number :]
+        del origin[len(origin) - instruction.number :]
+        if keep_order:
+            stack[instruction.destination].extend(moved)
+        else:
+            stack[instruction.destination].extend(reversed(moved))
+        if trace:
+            print(f"index {index}\n{display_stack(stack)}\n#######\n", level=TRACE)
     return stack
 
 
-def run2(stack: Dict[int, deque], instructions: List[Instruction]):
+def run(stack: Dict[int, List[str]], instructions: List[Instruction]):
+    """
+    Given a stack and instructions, run the process for step 1
+    """
+    return operate(stack, instructions, keep_order=False)
+
+
+def run2(stack: Dict[int, List[str]], instructions: List[Instruction]):
     """
     Given a stack and instructions, run the process for step 2
     """
-    for index, instruction in enumerate(instructions):
-        print(f"index {index} {instruction}")
-        temp = []
-        for _ in range(instruction.number):
-            value = stack[instruction.origin].popleft()
-            temp.append(value)
-        for item in reversed(temp):
-            stack[instruction.destination].appendleft(item)
-        print(f"index {index}\n{display_stack(deepcopy(stack))}\n#######\n")
-    return stack
+    return operate(stack, instructions, keep_order=True)
 
 
-for data_source_name, data_source in data_sources:
-    print(f"Day 1 - Result 1 - {data_source_name}")
-    stack, instructions = deepcopy(data_source)
-    print(f"stack before:\n{display_stack(deepcopy(stack))}")
-    processed_stack = run(stack, instructions)
-    print(f"stack after:\n{display_stack(processed_stack)}")
+def top_crates(stack: Dict[int, List[str]]) -> str:
+    """
+    Given a stack, return the crates on top of each stack
+    """
+    return "".join(stack[index][-1] for index in sorted(stack.keys()) if stack[index])
 
-    print(f"Day 1 - Result 2 - {data_source_name}")
-    stack, instructions = data_source
-    print(f"stack before:\n{display_stack(deepcopy(stack))}")
-    processed_stack = run2(stack, instructions)
-    print(f"stack after:\n{display_stack(processed_stack)}")
+
+def find_top_crates(
+    stack: Dict[int, List[str]], instructions: List[Instruction], keep_order: bool
+) -> str:
+    """
+    Given a stack and instructions, return the crates on top of each stack once the
+    instructions are run, crates moved at once keeping their order if keep_order, one
+    by one otherwise.
+
+    Instead of moving every crate, the final top of each stack is followed backwards
+    through the instructions, as a (stack, depth from the top) position, up to the
+    crate it was in the initial stack.
+    """
+    heights = {index: len(crates) for index, crates in stack.items()}
+    for instruction in instructions:
+        assert (
+            instruction.number <= heights[instruction.origin]
+        ), f"Not enough crates for {instruction}"
+        heights[instruction.origin] -= instruction.number
+        heights[instruction.destination] += instruction.number
+
+    # Final top of each non empty stack, by the stack it is currently in
+    positions = {index: [] for index in stack}
+    depths = {}
+    for index, height in heights.items():
+        if height:
+            positions[index].append(index)
+            depths[index] = 0
+
+    for instruction in reversed(instructions):
+        # Crates moved onto their own stack end up where they were
+        if instruction.origin == instruction.destination:
+            continue
+        number = instruction.number
+        origin = positions[instruction.origin]
+        for top in origin:
+            depths[top] += number
+
+        kept = []
+        for top in positions[instruction.destination]:
+            depth = depths[top]
+            if depth >= number:
+                depths[top] = depth - number
+                kept.append(top)
+            else:
+                depths[top] = depth if keep_order else number - 1 - depth
+                origin.append(top)
+        positions[instruction.destination] = kept
+
+    crates = {}
+    for index, tops in positions.items():
+        for top in tops:
+            crates[top] = stack[index][-1 - depths[top]]
+    return "".join(crates[index] for index in sorted(crates))
+
+
+def part1(data: Tuple[Dict[int, List[str]], List[Instruction]]) -> str:
+    return find_top_crates(*data, keep_order=False)
+
+
+def part2(data: Tuple[Dict[int, List[str]], List[Instruction]]) -> str:
+    return find_top_crates(*data, keep_order=True)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (
+        ("Test data", test_data),
+        ("Prod data", prod_data),
+    )
+
+    for data_source_name, data_source in data_sources:
+        print(f"Day 1 - Result 1 - {data_source_name}")
+        stack, instructions = data_source
+        if is_enabled(DEBUG):
+            print(f"stack before:\n{display_stack(stack)}", level=DEBUG)
+        processed_stack = run(stack, instructions)
+        print(f"stack after:\n{display_stack(processed_stack)}")
+
+        print(f"Day 1 - Result 2 - {data_source_name}")
+        stack, instructions = data_source
+        if is_enabled(DEBUG):
+            print(f"stack before:\n{display_stack(stack)}", level=DEBUG)
+        processed_stack = run2(stack, instructions)
+        print(f"stack after:\n{display_stack(processed_stack)}")
+
+
+if __name__ == "__main__":
+    main()
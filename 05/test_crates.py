@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from main import CraneStackReader, Instruction, find_top_crates, operate, top_crates
+
+from aoc.generators import write
+from utils import out
+
+
+class TestCrates(unittest.TestCase):
+    def setUp(self):
+        # The default trace level would display the stacks after every instruction
+        level = out.get_level()
+        out.set_level(out.QUIET)
+        self.addCleanup(out.set_level, level)
+
+    def test_find_top_crates(self):
+        for stacks, height, max_move in (
+            (3, 1, 3),
+            (9, 8, 10),
+            (57, 3, 6),
+            (1200, 2, 4),
+        ):
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+                write(
+                    5,
+                    2000,
+                    stacks,
+                    out=f,
+                    stacks=stacks,
+                    height=height,
+                    max_move=max_move,
+                )
+            try:
+                stack, instructions = CraneStackReader(f.name).read()
+            finally:
+                os.remove(f.name)
+
+            self.assertEqual(len(stack), stacks)
+            for keep_order in (False, True):
+                with self.subTest(stacks=stacks, keep_order=keep_order):
+                    expected = top_crates(operate(stack, instructions, keep_order))
+                    self.assertEqual(
+                        find_top_crates(stack, instructions, keep_order), expected
+                    )
+
+    def test_same_stack(self):
+        stack = {1: ["Z", "N"], 2: ["M", "C", "D"], 3: ["P"]}
+        instructions = [Instruction(number=2, origin=2, destination=2)]
+        for keep_order in (False, True):
+            with self.subTest(keep_order=keep_order):
+                moved = operate(stack, instructions, keep_order)
+                self.assertEqual(moved, stack)
+                self.assertEqual(top_crates(moved), "NDP")
+                self.assertEqual(
+                    find_top_crates(stack, instructions, keep_order), "NDP"
+                )
+
+    def test_not_enough_crates(self):
+        stack = {1: ["Z", "N"], 2: ["M", "C", "D"], 3: ["P"]}
+        instructions = [Instruction(number=2, origin=3, destination=1)]
+        for keep_order in (False, True):
+            with self.subTest(keep_order=keep_order):
+                with self.assertRaises(AssertionError):
+                    operate(stack, instructions, keep_order)
+                with self.assertRaises(AssertionError):
+                    find_top_crates(stack, instructions, keep_order)
+
+
+if __name__ == "__main__":
+    unittest.main()
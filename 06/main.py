@@ -1,31 +1,86 @@
-import more_itertools
+from typing import Dict, Iterable, Iterator, Optional
+
 from utils.out import print
 from utils.readers import FileReader
 
-test_reader = FileReader("input-test.txt")
-test_data = test_reader.read()
 
-reader = FileReader("input.txt")
-prod_data = reader.read()
+def parse(file: str) -> str:
+    """
+    Given a file, return its whole content, see stream to read it by chunks
+    """
+    return FileReader(file).cached_read()
+
+
+def stream(file: str, chunk_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Given a file, lazily return its decoded content by chunks, for find_markers
+    """
+    return FileReader(file).iter_text(chunk_size)
+
+
+def find_markers(
+    chunks: Iterable[str], window_sizes: Iterable[int]
+) -> Dict[int, Optional[int]]:
+    """
+    Given a stream of str chunks (e.g. stream or FileReader.iter_text) and window
+    sizes, return for each size the index of the first character found after the
+    first window composed of unique characters, in a single pass.
+
+    The start of the current run of unique characters jumps past the previous
+    occurrence of each character read, so each character is only looked at once.
+    """
+    pending = sorted(set(window_sizes))
+    markers = {window_size: None for window_size in pending}
+    last_seen = {}
+    start = 0
+    position = 0
+
+    for chunk in chunks:
+        for char in chunk:
+            seen = last_seen.get(char, -1)
+            if seen >= start:
+                start = seen + 1
+            last_seen[char] = position
+            position += 1
+
+            while pending and position - start >= pending[0]:
+                markers[pending.pop(0)] = position
+            if not pending:
+                return markers
 
-data_sources = (
-    ("Test data", test_data),
-    ("Prod data", prod_data),
-)
+    return markers
 
 
-def find_packet(data: str, window_size: int) -> int:
+def find_packet(data: str, window_size: int) -> Optional[int]:
     """
     Given a string, return the index of the first character found after the first
     windows composed of unique characters.
     """
-    windows = more_itertools.sliding_window(data, window_size)
-    for index, window in enumerate(windows):
-        char_set = set(window)
-        if len(char_set) == len(window):
-            return index + window_size
+    return find_markers([data], [window_size])[window_size]
+
+
+def part1(data: str) -> int:
+    return find_packet(data, 4)
+
+
+def part2(data: str) -> int:
+    return find_packet(data, 14)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (
+        ("Test data", test_data),
+        ("Prod data", prod_data),
+    )
+
+    for data_source_name, data_source in data_sources:
+        markers = find_markers([data_source], [4, 14])
+        print(f"Day 1 - Result 1 - {data_source_name}: {markers[4]}")
+        print(f"Day 1 - Result 1 - {data_source_name}: {markers[14]}")
 
 
-for data_source_name, data_source in data_sources:
-    print(f"Day 1 - Result 1 - {data_source_name}: {find_packet(data_source, 4)}")
-    print(f"Day 1 - Result 1 - {data_source_name}: {find_packet(data_source, 14)}")
+if __name__ == "__main__":
+    main()
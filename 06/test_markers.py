@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from main import find_markers, stream
+
+from aoc.generators import write
+
+SIZE = 20000
+
+
+class TestMarkers(unittest.TestCase):
+    def test_stream(self):
+        for window_size in (14, 100, 1000):
+            with self.subTest(window_size=window_size):
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", suffix=".txt", delete=False
+                ) as f:
+                    write(6, SIZE, 1, out=f, window_size=window_size)
+                try:
+                    with open(f.name, encoding="utf-8") as text:
+                        data = text.read()
+                    window_sizes = [4, window_size]
+                    expected = find_markers([data], window_sizes)
+                    self.assertEqual(expected[window_size], SIZE)
+                    for chunk_size in (7, 4096):
+                        markers = find_markers(stream(f.name, chunk_size), window_sizes)
+                        self.assertEqual(markers, expected)
+                finally:
+                    os.remove(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,61 +1,71 @@
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
 
-from rich.tree import Tree
-
-from utils.out import print
+from utils.out import DEBUG, is_enabled, print
 from utils.readers import FileReader
 
+if TYPE_CHECKING:
+    from rich.tree import Tree
+
 
 class Directory:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class File:
     name: str
     size: int
     parent: Directory
 
-    def to_tree(self, tree: Tree):
+    def to_tree(self, tree: "Tree"):
         tree.add(f"{self.name} - {self.size}")
         return tree
 
 
-@dataclass
+@dataclass(slots=True)
 class Directory:
     name: str
-    content: List
     parent: Optional[Directory]
+    size: int = 0
+    content: List = field(default_factory=list)
+    files: Dict[str, File] = field(default_factory=dict)
+    directories: Dict[str, Directory] = field(default_factory=dict)
+    listed: bool = False
 
-    def to_tree(self, tree: Tree):
+    def to_tree(self, tree: "Tree"):
         subtree = tree.add(f"{self.name}")
         for content in self.content:
             subtree = content.to_tree(subtree)
         return tree
 
-    @property
-    def size(self) -> int:
-        return sum(map(lambda x: x.size, self.content))
+    def add(self, item):
+        """
+        Add a file or a directory, unless already there, and its size to the size of
+        the directory only, see fold_sizes. Return the item in the directory.
+        """
+        entries = self.files if isinstance(item, File) else self.directories
+        if item.name in entries:
+            return entries[item.name]
 
-    def contains_file(self, file: File):
-        for content in self.content:
-            if type(content) == File and content.name == file.name:
-                return content
-        return None
+        entries[item.name] = item
+        self.content.append(item)
+        self.size += item.size
+        return item
 
-    def contains_dir(self, dir: Directory):
-        for content in self.content:
-            if type(content) == Directory and content.name == dir.name:
-                return content
-        return None
+    def contains_file(self, name: str) -> Optional[File]:
+        return self.files.get(name)
+
+    def contains_dir(self, name: str) -> Optional[Directory]:
+        return self.directories.get(name)
 
 
 def line_to_file_or_dir(line, parent: Directory):
-    if "dir" in line:
-        line = line.replace("dir ", "")
-        return Directory(name=line, content=list(), parent=parent)
+    if line.startswith("dir "):
+        return Directory(name=line[4:], parent=parent)
     size, name = line.split(" ")
     return File(name=name, size=int(size), parent=parent)
 
@@ -86,110 +96,144 @@ class CommandReader(FileReader):
     dir d
     """
 
-    def read(self, *args):
-        """
-        Implementation of a one column space aware data file read function
+    streaming = True
+
+    def read(self, *args, keep_files: bool = True) -> Directory:
         """
-        data = super(CommandReader, self).read()
-        data = data.split("$")
-        data = [line for line in data if line]
+        Implementation of a streaming command transcript read function, building the
+        tree line by line. Entries only add their size to their directory, directory
+        totals are folded into their ancestors once the transcript is read.
 
-        root = Directory(name="/", content=list(), parent=None)
+        :param keep_files: Keep the file entries, otherwise only the directory sizes
+        are kept and memory only depends on the number of directories
+        """
+        root = Directory(name="/", parent=None)
         current_directory = root
+        listing = False
 
-        for raw_command in data[1:]:
-            command_type = to_command_type(raw_command)
+        for line in self.lines():
+            if not line.startswith("$"):
+                if not listing:
+                    continue
+                if line.startswith("dir ") or keep_files:
+                    current_directory.add(
+                        line_to_file_or_dir(line, parent=current_directory)
+                    )
+                else:
+                    current_directory.size += int(line.split(" ", 1)[0])
+                continue
+
+            command_type = to_command_type(line[1:])
             if command_type == CommandType.CD:
-                dir_name = raw_command.split(" ")[2].strip()
-                if dir_name == "..":
+                dir_name = line[5:]
+                if dir_name == "/":
+                    current_directory = root
+                elif dir_name == "..":
                     current_directory = current_directory.parent
-                    continue
-
-                target = current_directory.contains_dir(
-                    Directory(name=dir_name, content=list(), parent=None)
-                )
-                assert target is not None
-                current_directory = target
+                else:
+                    target = current_directory.contains_dir(dir_name)
+                    assert target is not None
+                    current_directory = target
+                listing = False
 
             if command_type == CommandType.LS:
-                raw_command = raw_command.splitlines()
-                result = raw_command[1:]
-                for line in result:
-                    item = line_to_file_or_dir(line, parent=current_directory)
-                    if type(item) == File:
-                        # Is the file already in the dir ?
-                        if current_directory.contains_file(item) is None:
-                            current_directory.content.append(item)
-                    else:
-                        # Is the dir already in the dir ?
-                        if current_directory.contains_dir(item) is None:
-                            current_directory.content.append(item)
+                # Listing twice would count the files twice without file entries
+                listing = keep_files or not current_directory.listed
+                current_directory.listed = True
+
+        fold_sizes(root)
         return root
 
 
-test_reader = CommandReader("input-test.txt")
-test_data = test_reader.read()
+def parse(file: str) -> Directory:
+    return CommandReader(file).cached_read()
 
-reader = CommandReader("input.txt")
-prod_data = reader.read()
 
-data_sources = (
-    ("Test data", test_data),
-    ("Prod data", prod_data),
-)
+def iter_directories(root: Directory) -> Iterator[Directory]:
+    """
+    Given a root directory, iterate over it and all its sub directories
+    """
+    to_visit = [root]
+    while to_visit:
+        directory = to_visit.pop()
+        yield directory
+        to_visit.extend(directory.directories.values())
 
 
-def find_small_directories(root: Directory) -> List[Directory]:
+def fold_sizes(root: Directory) -> None:
     """
-    Given a root directory, find all the small directories
+    Given a root directory whose directories only hold the size of their own entries,
+    add the size of each directory to its parent, sub directories first, so that
+    each directory holds its total size in a single pass over the tree.
     """
-    result = []
-    for content in root.content:
-        if type(content) == Directory:
-            if content.size < 100000:
-                result.append(content)
-            result.extend(find_small_directories(content))
+    for directory in reversed(list(iter_directories(root))):
+        if directory is not root:
+            directory.parent.size += directory.size
 
-    return result
 
-
-def find_smallest_directory_to_delete(root: List, min: int) -> Directory:
+class DirectoryIndex:
     """
-    Given a root directory, find the smallest directory above the min size
+    Index of all the directories of a tree sorted by size, with the prefix sums of
+    their sizes
     """
-    smallest_directory_to_delete = root
-    for content in root.content:
-        if type(content) == Directory:
-            if min < content.size < smallest_directory_to_delete.size:
-                smallest_directory_to_delete = content
-
-            smallest_directory_to_delete_child = find_smallest_directory_to_delete(
-                content, min
-            )
-            if (
-                smallest_directory_to_delete.size
-                > smallest_directory_to_delete_child.size
-                > min
-            ):
-                smallest_directory_to_delete = smallest_directory_to_delete_child
-
-    return smallest_directory_to_delete
-
-
-for data_source_name, data_source in data_sources:
-    tree = Tree("File system")
-    tree = data_source.to_tree(tree)
-    print(f"Day 1 - Result 1 - {data_source_name}:")
-    print(tree)
-
-    small_directories = find_small_directories(data_source)
-    small_directories_total_size = sum(map(lambda x: x.size, small_directories))
-    print(f"Day 1 - Result 1 - {data_source_name}: {small_directories_total_size}")
-
-    unused_space = 70000000 - data_source.size
+
+    def __init__(self, root: Directory) -> None:
+        self.root = root
+        self.directories = sorted(iter_directories(root), key=lambda x: x.size)
+        self.sizes = [directory.size for directory in self.directories]
+        self.size_sums = list(accumulate(self.sizes, initial=0))
+
+    def total_size_below(self, max: int) -> int:
+        """
+        Return the total size of the sub directories strictly smaller than max, the
+        root directory not being counted
+        """
+        total = self.size_sums[bisect_left(self.sizes, max)]
+        if self.root.size < max:
+            total -= self.root.size
+        return total
+
+    def smallest_above(self, min: int) -> Optional[Directory]:
+        """
+        Return the smallest directory strictly bigger than min
+        """
+        index = bisect_right(self.sizes, min)
+        if index == len(self.directories):
+            return None
+        return self.directories[index]
+
+
+def part1(root: Directory) -> int:
+    return DirectoryIndex(root).total_size_below(100000)
+
+
+def part2(root: Directory) -> int:
+    unused_space = 70000000 - root.size
     to_free = 30000000 - unused_space
+    return DirectoryIndex(root).smallest_above(to_free).size
+
+
+def main():
+    from rich.tree import Tree
+
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
 
-    smallest_directory_to_delete = find_smallest_directory_to_delete(
-        data_source, to_free
+    data_sources = (
+        ("Test data", test_data),
+        ("Prod data", prod_data),
     )
-    print(f"Day 1 - Result 2 - {data_source_name}: {smallest_directory_to_delete.size}")
+
+    for data_source_name, data_source in data_sources:
+        if is_enabled(DEBUG):
+            tree = Tree("File system")
+            tree = data_source.to_tree(tree)
+            print(f"Day 1 - Result 1 - {data_source_name}:", level=DEBUG)
+            print(tree, level=DEBUG)
+
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {part2(data_source)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from main import CommandReader, DirectoryIndex, iter_directories, parse, part1
+
+from aoc.generators import write
+
+SMALL_TRANSCRIPT = """$ cd /
+$ ls
+dir a
+10 b.txt
+$ cd a
+$ ls
+20 c.txt
+"""
+
+
+def recursive_size(directory) -> int:
+    return sum(file.size for file in directory.files.values()) + sum(
+        map(recursive_size, directory.directories.values())
+    )
+
+
+def write_transcript(content: str) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(content)
+    return f.name
+
+
+class TestDirectories(unittest.TestCase):
+    def test_root_not_counted(self):
+        file = write_transcript(SMALL_TRANSCRIPT)
+        try:
+            self.assertEqual(part1(parse(file)), 20)
+        finally:
+            os.remove(file)
+
+    def test_total_size_below(self):
+        root = parse(os.path.join(os.path.dirname(__file__), "input-test.txt"))
+        index = DirectoryIndex(root)
+        for max in (0, 100, 584, 100000, 48381165, 10**9):
+            with self.subTest(max=max):
+                expected = sum(
+                    directory.size
+                    for directory in iter_directories(root)
+                    if directory is not root and directory.size < max
+                )
+                self.assertEqual(index.total_size_below(max), expected)
+        self.assertEqual(part1(root), 95437)
+
+    def test_deep_sizes(self):
+        for size, max_children, max_depth in ((800, 1, 800), (3000, 3, 50)):
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+                write(
+                    7,
+                    size,
+                    1,
+                    out=f,
+                    max_children=max_children,
+                    max_depth=max_depth,
+                )
+            try:
+                root = CommandReader(f.name).read()
+                sizes_only = CommandReader(f.name).read(keep_files=False)
+            finally:
+                os.remove(f.name)
+
+            with self.subTest(max_children=max_children):
+                directories = list(iter_directories(root))
+                self.assertEqual(len(directories), size)
+                for directory in directories:
+                    self.assertEqual(directory.size, recursive_size(directory))
+
+                # Both trees are walked in the same order
+                self.assertEqual(
+                    [directory.size for directory in iter_directories(sizes_only)],
+                    [directory.size for directory in directories],
+                )
+                self.assertFalse(any(d.files for d in iter_directories(sizes_only)))
+
+
+if __name__ == "__main__":
+    unittest.main()
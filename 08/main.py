@@ -1,33 +1,16 @@
-from dataclasses import dataclass
+from typing import Tuple
 
 import numpy as np
-from rich.tree import Tree
 
-from utils.math import multiply
 from utils.out import print
-from utils.readers import OneColumnFileReader
+from utils.readers import FileReader
 
+# Number of trees whose left and right viewing distances are computed at once, to
+# bound memory
+BLOCK_SIZE = 1 << 23
 
-@dataclass
-class Tree:
-    x: int
-    y: int
-    height: int
-    shape: tuple
 
-    def on_edge(self):
-        """
-        Is the tree on  the edge ?
-        """
-        return (
-            self.x == 0
-            or self.y == 0
-            or self.x == self.shape[0] - 1
-            or self.y == self.shape[1] - 1
-        )
-
-
-class TreeMapReader(OneColumnFileReader):
+class TreeMapReader(FileReader):
     """
     Implementation of a tree map reader
 
@@ -40,104 +23,132 @@ class TreeMapReader(OneColumnFileReader):
     35390
     """
 
-    def read(self, *args):
-        data = super(TreeMapReader, self).read()
-        raw_array = []
-        for row in data:
-            raw_array.append(list(map(int, list(row))))
-        return np.array(raw_array)
-
+    def read(self, *args) -> np.ndarray:
+        with open(self.file, "rb") as f:
+            rows = f.read().split()
+        tree_map = np.frombuffer(b"".join(rows), dtype=np.uint8) - ord("0")
+        return tree_map.reshape(len(rows), -1)
 
-test_reader = TreeMapReader("input-test.txt")
-test_data = test_reader.read()
 
-reader = TreeMapReader("input.txt")
-prod_data = reader.read()
+def parse(file: str) -> np.ndarray:
+    return TreeMapReader(file).cached_read()
 
-data_sources = (
-    ("Test data", test_data),
-    ("Prod data", prod_data),
-)
 
+def sweep(heights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Given a tree map, return the visibility and the viewing distance of each tree
+    looking towards the top of its column.
 
-def is_tree_hidden(tree_map: np.ndarray, tree: Tree):
+    The map is swept one row at a time, for all the columns at once. A tree is visible
+    if it is higher than the running maximum of its column. Its viewing distance is
+    its distance to the last tree at least as high, the row of the last tree at least
+    as high as each possible height being kept for each column.
+    """
+    rows, columns = heights.shape
+    dtype = np.int16 if rows < 2**15 else np.int32
+    levels = np.arange(int(heights.max(initial=0)) + 1, dtype=heights.dtype)[:, None]
+    last = np.zeros((len(levels), columns), dtype=dtype)
+    blocking = np.empty(last.shape, dtype=bool)
+    blocking_rows = np.empty(last.shape, dtype=dtype)
+    # Index of last[height, column] in the flattened last rows, for each column
+    positions = np.empty(columns, dtype=np.intp)
+    column_indexes = np.arange(columns, dtype=np.intp)
+    running_max = np.full(columns, -1, dtype=np.int16)
+
+    visible = np.empty(heights.shape, dtype=bool)
+    distance = np.empty(heights.shape, dtype=dtype)
+    for row, row_heights in enumerate(heights):
+        np.greater(row_heights, running_max, out=visible[row])
+        np.maximum(running_max, row_heights, out=running_max)
+
+        np.multiply(row_heights, np.intp(columns), out=positions)
+        positions += column_indexes
+        np.subtract(row, last.take(positions), out=distance[row])
+
+        # Rows only grow, the tree becomes the last one at least as high as its height
+        np.less_equal(levels, row_heights, out=blocking)
+        np.multiply(blocking, dtype(row), out=blocking_rows)
+        np.maximum(last, blocking_rows, out=last)
+
+    return visible, distance
+
+
+def survey(tree_map: np.ndarray) -> Tuple[int, int]:
     """
-    Given a tree map and a tree, check is the tree is hidden, and if it is, compute
-    it's scenic score.
+    Given a tree map, return the number of visible trees and the best scenic score,
+    sweeping the map once in each direction.
+
+    The up and down sweeps are kept for the whole map, the left and right ones are
+    made by blocks of rows, whose scenic scores are reduced to their max right away.
     """
-    if tree.on_edge():
-        return False, 0
-
-    row = tree_map[tree.y]
-    column = tree_map[:, tree.x]
-
-    to_compare_list = [
-        list(reversed(column[: tree.y])),  # up
-        list(reversed(row[: tree.x])),  # left
-        column[tree.y + 1 :],  # down
-        row[tree.x + 1 :],  # right
-    ]
-
-    scenic_scores = []
-    is_hidden = []
-    for to_compare in to_compare_list:
-        scenic_score = 0
-        is_hidden_local = False
-        for index, other_tree in enumerate(to_compare):
-            if index == 0:
-                scenic_score += 1
-            else:
-                if other_tree <= tree.height:
-                    scenic_score += 1
-                if other_tree == tree.height:
-                    break
-
-        for other_tree in to_compare:
-            if other_tree >= tree.height:
-                is_hidden_local = True
-
-        scenic_scores.append(scenic_score)
-        is_hidden.append(is_hidden_local)
-
-    return all(is_hidden), multiply(scenic_scores)
+    rows, columns = tree_map.shape
+    visible, up = sweep(tree_map)
+    visible_down, down = sweep(tree_map[::-1])
+    visible |= visible_down[::-1]
+    del visible_down
+    down = down[::-1]
+
+    visible_trees = 0
+    best_scenic_score = 0
+    block_rows = max(1, BLOCK_SIZE // max(columns, 1))
+    for start in range(0, rows, block_rows):
+        rows_slice = slice(start, start + block_rows)
+        # Rows of the block as columns, so that they are swept all at once
+        block = np.ascontiguousarray(tree_map[rows_slice].T)
+        visible_left, left = sweep(block)
+        visible_right, right = sweep(block[::-1])
+
+        visible_left |= visible_right[::-1]
+        visible_left = visible_left.T
+        visible_left |= visible[rows_slice]
+        visible_trees += int(np.count_nonzero(visible_left))
+
+        scenic_scores = left.astype(np.int64)
+        scenic_scores *= right[::-1]
+        scenic_scores = scenic_scores.T
+        scenic_scores *= up[rows_slice]
+        scenic_scores *= down[rows_slice]
+        best_scenic_score = max(best_scenic_score, int(scenic_scores.max(initial=0)))
+
+    return visible_trees, best_scenic_score
 
 
 def compute_visible_tree_number(tree_map: np.ndarray) -> int:
     """
     Given a tree map, compute the number of visible trees
     """
-    visible_trees = 0
-    for tree in np.ndenumerate(tree_map):
-        hidden, score = is_tree_hidden(
-            tree_map,
-            Tree(x=tree[0][1], y=tree[0][0], height=tree[1], shape=tree_map.shape),
-        )
-        if not hidden:
-            visible_trees += 1
-
-    return visible_trees
+    return survey(tree_map)[0]
 
 
 def compute_best_scenic_score(tree_map: np.ndarray) -> int:
     """
     Given a tree map, compute the best scenic score possible
     """
-    best_scenic_score = 0
-    for tree in np.ndenumerate(tree_map):
-        hidden, score = is_tree_hidden(
-            tree_map,
-            Tree(x=tree[0][1], y=tree[0][0], height=tree[1], shape=tree_map.shape),
-        )
-        if not hidden and score > best_scenic_score:
-            best_scenic_score = score
+    return survey(tree_map)[1]
 
-    return best_scenic_score
 
+def part1(tree_map: np.ndarray) -> int:
+    return compute_visible_tree_number(tree_map)
 
-for data_source_name, data_source in data_sources:
-    print(
-        f"Day 1 - Result 1 - {data_source_name}: {compute_visible_tree_number(data_source)}"
-    )
-    print(
-        f"Day 1 - Result 2 - {data_source_name}: {compute_best_scenic_score(data_source)}"
+
+def part2(tree_map: np.ndarray) -> int:
+    return compute_best_scenic_score(tree_map)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
+
+    data_sources = (
+        ("Test data", test_data),
+        ("Prod data", prod_data),
     )
+
+    for data_source_name, data_source in data_sources:
+        visible_tree_number, best_scenic_score = survey(data_source)
+        print(f"Day 1 - Result 1 - {data_source_name}: {visible_tree_number}")
+        print(f"Day 1 - Result 2 - {data_source_name}: {best_scenic_score}")
+
+
+if __name__ == "__main__":
+    main()
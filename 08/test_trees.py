@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+import main
+from main import survey
+
+TEST_MAP = np.array(
+    [list(map(int, row)) for row in ("30373", "25512", "65332", "33549", "35390")],
+    dtype=np.uint8,
+)
+
+
+def brute_force_survey(tree_map: np.ndarray):
+    """
+    Given a tree map, return the number of visible trees and the best scenic score,
+    walking from each tree in each direction
+    """
+    rows, columns = tree_map.shape
+    visible_trees = 0
+    best_scenic_score = 0
+    for row in range(rows):
+        for column in range(columns):
+            height = tree_map[row, column]
+            visible = False
+            scenic_score = 1
+            for dy, dx in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+                y, x = row + dy, column + dx
+                distance = 0
+                while 0 <= y < rows and 0 <= x < columns:
+                    distance += 1
+                    if tree_map[y, x] >= height:
+                        break
+                    y, x = y + dy, x + dx
+                else:
+                    visible = True
+                scenic_score *= distance
+            visible_trees += visible
+            best_scenic_score = max(best_scenic_score, scenic_score)
+    return visible_trees, best_scenic_score
+
+
+class TestTrees(unittest.TestCase):
+    def test_example(self):
+        self.assertEqual(survey(TEST_MAP), (21, 8))
+
+    def test_brute_force(self):
+        rng = np.random.default_rng(8)
+        for shape in ((1, 1), (1, 7), (6, 1), (5, 5), (13, 29), (40, 17), (64, 64)):
+            for top in (1, 9):
+                with self.subTest(shape=shape, top=top):
+                    tree_map = rng.integers(0, top + 1, shape, dtype=np.uint8)
+                    self.assertEqual(survey(tree_map), brute_force_survey(tree_map))
+
+    def test_blocks(self):
+        rng = np.random.default_rng(80)
+        tree_map = rng.integers(0, 10, (37, 23), dtype=np.uint8)
+        expected = brute_force_survey(tree_map)
+        self.addCleanup(setattr, main, "BLOCK_SIZE", main.BLOCK_SIZE)
+        for block_size in (1, 23, 100):
+            with self.subTest(block_size=block_size):
+                main.BLOCK_SIZE = block_size
+                self.assertEqual(survey(tree_map), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+from array import array
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from utils.out import print
 from utils.readers import OneColumnFileReader
@@ -57,97 +58,209 @@ class Position:
         return abs(position.x - self.x) <= 1 and abs(position.y - self.y) <= 1
 
 
-@dataclass
-class Rope:
-    head: Position
-    knots: List[Position]
-    tail: Position
-    previous_tail_positions: Set[Tuple[int, int]]
+# Packed cells are y * CELL_STRIDE + x, unique as long as abs(x) < CELL_STRIDE / 2
+CELL_STRIDE = 1 << 32
+
+# Largest bounding box area for which visited cells are recorded in a grid
+GRID_LIMIT = 1 << 26
+
+# Move of the head for each direction
+DELTAS = {
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+}
+
+# min x, min y, max x, max y
+Bounds = Tuple[int, int, int, int]
+
+
+class Cells:
+    """
+    Base class for sets of visited cells
+    """
+
+    def add(self, x: int, y: int) -> None:
+        raise NotImplementedError
 
-    def follow(self, head: Position, tail: Position, record: bool):
+    def add_segment(self, x: int, y: int, dx: int, dy: int, count: int) -> None:
         """
-        Given a head and tail, if the tail is not touching the head, update the tail
-        to follow the head according to the rules
+        Given a cell, a step and a count, add the count cells following the given one
         """
-        if tail.is_touching(head):
-            return
+        for step in range(1, count + 1):
+            self.add(x + dx * step, y + dy * step)
 
-        x_direction = head.x - tail.x
-        y_direction = head.y - tail.y
+    def __len__(self) -> int:
+        raise NotImplementedError
 
-        # Move non diagonally
-        if y_direction == 0:
-            if x_direction < 0:
-                tail.x += -1
-            else:
-                tail.x += 1
 
-        if x_direction == 0:
-            if y_direction < 0:
-                tail.y += -1
-            else:
-                tail.y += 1
+class PackedCells(Cells):
+    """
+    Set of visited cells, each cell being packed in a single int
+    """
 
-        # Move diagonally
-        if x_direction < 0 and y_direction < 0:
-            tail.x += -1
-            tail.y += -1
+    def __init__(self) -> None:
+        self.cells = set()
 
-        if x_direction < 0 and y_direction > 0:
-            tail.x += -1
-            tail.y += 1
+    def add(self, x: int, y: int) -> None:
+        self.cells.add(y * CELL_STRIDE + x)
 
-        if x_direction > 0 and y_direction < 0:
-            tail.x += 1
-            tail.y += -1
+    def add_segment(self, x: int, y: int, dx: int, dy: int, count: int) -> None:
+        start = y * CELL_STRIDE + x
+        step = dy * CELL_STRIDE + dx
+        self.cells.update(range(start + step, start + step * (count + 1), step))
 
-        if x_direction > 0 and y_direction > 0:
-            tail.x += 1
-            tail.y += 1
+    def __len__(self) -> int:
+        return len(self.cells)
 
-        if record:
-            self.previous_tail_positions.add(tail.to_tuple())
 
-    def play_move(self, direction: Direction, count: int):
-        """
-        Given a direction and a count, play the move
-        """
-        for _ in range(count):
-            match direction:
-                case Direction.RIGHT:
-                    self.move_head(self.head.x + 1, self.head.y)
-                case Direction.LEFT:
-                    self.move_head(self.head.x - 1, self.head.y)
-                case Direction.UP:
-                    self.move_head(self.head.x, self.head.y + 1)
-                case Direction.DOWN:
-                    self.move_head(self.head.x, self.head.y - 1)
-
-    def follow_knots(self):
+class GridCells(Cells):
+    """
+    Set of visited cells within known bounds, recorded in a flat byte grid
+    """
+
+    def __init__(self, bounds: Bounds) -> None:
+        self.min_x, self.min_y, max_x, max_y = bounds
+        self.width = max_x - self.min_x + 1
+        self.grid = bytearray(self.width * (max_y - self.min_y + 1))
+
+    def add(self, x: int, y: int) -> None:
+        self.grid[(y - self.min_y) * self.width + x - self.min_x] = 1
+
+    def add_segment(self, x: int, y: int, dx: int, dy: int, count: int) -> None:
+        start = (y - self.min_y) * self.width + x - self.min_x
+        step = dy * self.width + dx
+        first, last = sorted((start + step, start + step * count))
+        self.grid[first : last + 1 : abs(step)] = b"\x01" * count
+
+    def __len__(self) -> int:
+        return len(self.grid) - self.grid.count(0)
+
+
+def compute_bounds(moves: List) -> Bounds:
+    """
+    Given a list of moves, return the bounds of the cells visited by the head, which
+    the knots following it never leave
+    """
+    x = y = min_x = min_y = max_x = max_y = 0
+    for direction, count in moves:
+        dx, dy = DELTAS[direction]
+        x += dx * count
+        y += dy * count
+        min_x, max_x = min(min_x, x), max(max_x, x)
+        min_y, max_y = min(min_y, y), max(max_y, y)
+    return min_x, min_y, max_x, max_y
+
+
+def make_cells(bounds: Optional[Bounds] = None, count: int = 1) -> Cells:
+    """
+    Given optional bounds and the number of sets of cells made for them, return an
+    empty set of cells, a grid if the bounds are known and the count grids together
+    stay within GRID_LIMIT bytes
+    """
+    if bounds is not None:
+        min_x, min_y, max_x, max_y = bounds
+        if (max_x - min_x + 1) * (max_y - min_y + 1) * count <= GRID_LIMIT:
+            return GridCells(bounds)
+    return PackedCells()
+
+
+class Rope:
+    """
+    Rope of length knots, from the head to the tail, starting at (0, 0).
+
+    Knot coordinates are stored in two flat arrays. The cells visited by the tail are
+    in previous_tail_positions, the ones visited by the other tracked knots in
+    visited, by knot index.
+    """
+
+    def __init__(
+        self,
+        length: int = 2,
+        bounds: Optional[Bounds] = None,
+        tracked: Iterable[int] = (),
+    ) -> None:
+        assert length >= 2, "A rope has at least a head and a tail"
+        self.xs = array("q", [0]) * length
+        self.ys = array("q", [0]) * length
+        self.visited: Dict[int, Cells] = {}
+        indexes = {*tracked, length - 1}
+        for index in indexes:
+            assert 0 < index < length, f"No knot {index} in a rope of length {length}"
+            self.visited[index] = make_cells(bounds, len(indexes))
+            self.visited[index].add(0, 0)
+        # Visited cells of each knot, None for the knots that are not tracked
+        self.recorders: List[Optional[Cells]] = [
+            self.visited.get(index) for index in range(length)
+        ]
+
+    @property
+    def previous_tail_positions(self) -> Cells:
+        return self.visited[len(self.xs) - 1]
+
+    @previous_tail_positions.setter
+    def previous_tail_positions(self, cells: Cells) -> None:
+        self.visited[len(self.xs) - 1] = self.recorders[-1] = cells
+
+    @property
+    def head(self) -> Position:
+        return Position(self.xs[0], self.ys[0])
+
+    @property
+    def tail(self) -> Position:
+        return Position(self.xs[-1], self.ys[-1])
+
+    def follow_knots(self) -> bool:
         """
-        Ensure each knot are following the head
+        Ensure each knot are following the previous one, moving each knot not touching
+        the previous one by at most one step on each axis towards it, and return
+        whether the tail moved.
+
+        Knots after the first one that does not move do not move either.
         """
-        for index, knot in enumerate(self.knots):
-            if index == 0:
-                head = self.head
-            else:
-                head = self.knots[index - 1]
-            self.follow(head, knot, record=False)
-
-    def move_head(self, x: int, y: int):
+        xs, ys, recorders = self.xs, self.ys, self.recorders
+        for index in range(1, len(xs)):
+            dx = xs[index - 1] - xs[index]
+            dy = ys[index - 1] - ys[index]
+            if -1 <= dx <= 1 and -1 <= dy <= 1:
+                return False
+            xs[index] += (dx > 0) - (dx < 0)
+            ys[index] += (dy > 0) - (dy < 0)
+            if recorders[index] is not None:
+                recorders[index].add(xs[index], ys[index])
+
+        return True
+
+    def is_stretched(self, dx: int, dy: int) -> bool:
         """
-        Move the head to the given x and y coordinates, ensure that knots and the tail
-        move as well
+        Given a step, return whether each knot is one step behind the previous one
         """
-        self.head.x = x
-        self.head.y = y
+        xs, ys = self.xs, self.ys
+        for index in range(1, len(xs)):
+            if xs[index - 1] - xs[index] != dx or ys[index - 1] - ys[index] != dy:
+                return False
+        return True
 
-        self.follow_knots()
+    def play_move(self, direction: Direction, count: int):
+        """
+        Given a direction and a count, play the move.
 
-        knot = self.head
-        if self.knots:
-            knot = self.knots[-1]
-        self.follow(knot, self.tail, record=True)
+        Once the rope is stretched along the move, every knot moves with the head, so
+        the rest of the move is played at once.
+        """
+        dx, dy = DELTAS[direction]
+        xs, ys = self.xs, self.ys
+        for played in range(1, count + 1):
+            xs[0] += dx
+            ys[0] += dy
+            if self.follow_knots() and played < count and self.is_stretched(dx, dy):
+                for index, cells in self.visited.items():
+                    cells.add_segment(xs[index], ys[index], dx, dy, count - played)
+                for index in range(len(xs)):
+                    xs[index] += dx * (count - played)
+                    ys[index] += dy * (count - played)
+                return
 
 
 class MoveReader(OneColumnFileReader):
@@ -181,11 +294,11 @@ class MoveReader(OneColumnFileReader):
         return result
 
 
-def play1(moves: List):
+def play(moves: List, length: int) -> Rope:
     """
-    Play the move with a rope of length 2
+    Play the moves with a rope of the given length (head and tail included)
     """
-    rope = Rope(Position(0, 0), [], Position(0, 0), {(0, 0)})
+    rope = Rope(length, compute_bounds(moves))
 
     for direction, count in moves:
         rope.play_move(direction, count)
@@ -193,34 +306,56 @@ def play1(moves: List):
     return rope
 
 
-def play2(moves: List):
+def play_lengths(moves: List, lengths: Iterable[int]) -> Dict[int, Cells]:
     """
-    Play the move with a rope of length 10 (head, 9 knots, tail)
+    Play the moves with ropes of each of the given lengths at once, and return the
+    cells visited by the tail of each of them.
+
+    The knot n of a rope moves exactly like the tail of a rope of length n + 1, so a
+    single rope of the longest length is played, tracking the matching knots.
     """
-    knots = [
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-        Position(0, 0),
-    ]
-    rope = Rope(Position(0, 0), knots, Position(0, 0), {(0, 0)})
+    lengths = set(lengths)
+    rope = Rope(
+        max(lengths),
+        compute_bounds(moves),
+        tracked=[length - 1 for length in lengths],
+    )
 
     for direction, count in moves:
         rope.play_move(direction, count)
 
-    return rope
+    return {length: rope.visited[length - 1] for length in sorted(lengths)}
 
 
-def main():
-    test_reader = MoveReader("input-test.txt")
-    test_data = test_reader.read()
+def play1(moves: List) -> Rope:
+    """
+    Play the move with a rope of length 2
+    """
+    return play(moves, 2)
+
+
+def play2(moves: List) -> Rope:
+    """
+    Play the move with a rope of length 10 (head, 8 knots, tail)
+    """
+    return play(moves, 10)
+
 
-    reader = MoveReader("input.txt")
-    prod_data = reader.read()
+def parse(file: str) -> List:
+    return MoveReader(file).cached_read()
+
+
+def part1(moves: List) -> int:
+    return len(play1(moves).previous_tail_positions)
+
+
+def part2(moves: List) -> int:
+    return len(play2(moves).previous_tail_positions)
+
+
+def main():
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
 
     data_sources = (
         ("Test data", test_data),
@@ -228,14 +363,9 @@ def main():
     )
 
     for data_source_name, data_source in data_sources:
-        result = play1(data_source)
-        result2 = play2(data_source)
-        print(
-            f"Day 1 - Result 1 - {data_source_name}: {len(result.previous_tail_positions)}"
-        )
-        print(
-            f"Day 1 - Result 1 - {data_source_name}: {len(result2.previous_tail_positions)}"
-        )
+        visited = play_lengths(data_source, [2, 10])
+        print(f"Day 1 - Result 1 - {data_source_name}: {len(visited[2])}")
+        print(f"Day 1 - Result 1 - {data_source_name}: {len(visited[10])}")
 
 
 if __name__ == "__main__":
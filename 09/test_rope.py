@@ -0,0 +1,78 @@
+import unittest
+from main import (
+    GRID_LIMIT,
+    Direction,
+    GridCells,
+    PackedCells,
+    Rope,
+    compute_bounds,
+    play,
+    play_lengths,
+)
+
+LARGER_EXAMPLE = [
+    [Direction.RIGHT, 5],
+    [Direction.UP, 8],
+    [Direction.LEFT, 8],
+    [Direction.DOWN, 3],
+    [Direction.RIGHT, 17],
+    [Direction.DOWN, 10],
+    [Direction.LEFT, 25],
+    [Direction.UP, 20],
+]
+
+
+class TestRope(unittest.TestCase):
+    def test_lengths(self):
+        for length, expected in ((2, 88), (10, 36)):
+            with self.subTest(length=length):
+                rope = play(LARGER_EXAMPLE, length)
+                self.assertEqual(len(rope.previous_tail_positions), expected)
+
+    def test_play_lengths(self):
+        visited = play_lengths(LARGER_EXAMPLE, range(2, 12))
+        self.assertEqual(len(visited[2]), 88)
+        self.assertEqual(len(visited[10]), 36)
+        for length, cells in visited.items():
+            with self.subTest(length=length):
+                rope = play(LARGER_EXAMPLE, length)
+                self.assertEqual(len(cells), len(rope.previous_tail_positions))
+
+    def test_cells(self):
+        bounds = compute_bounds(LARGER_EXAMPLE)
+        self.assertEqual(bounds, (-11, -5, 14, 15))
+
+        for cells in (GridCells(bounds), PackedCells()):
+            with self.subTest(cells=type(cells).__name__):
+                rope = Rope(10)
+                rope.previous_tail_positions = cells
+                rope.previous_tail_positions.add(0, 0)
+                for direction, count in LARGER_EXAMPLE:
+                    rope.play_move(direction, count)
+                self.assertEqual(len(rope.previous_tail_positions), 36)
+
+    def test_grid_budget(self):
+        # Bounds of an eighth of the grid budget, a grid for at most 8 tracked knots
+        bounds = (0, 0, GRID_LIMIT // 8 // 1024 - 1, 1023)
+        for tracked, kind in ((range(1, 9), GridCells), (range(1, 10), PackedCells)):
+            with self.subTest(tracked=len(tracked)):
+                rope = Rope(len(tracked) + 1, bounds, tracked)
+                self.assertEqual(len(rope.visited), len(tracked))
+                for cells in rope.visited.values():
+                    self.assertIsInstance(cells, kind)
+                grids = sum(
+                    len(cells.grid)
+                    for cells in rope.visited.values()
+                    if isinstance(cells, GridCells)
+                )
+                self.assertLessEqual(grids, GRID_LIMIT)
+
+    def test_long_rope(self):
+        rope = Rope(30)
+        rope.play_move(Direction.UP, 40)
+        self.assertEqual((rope.tail.x, rope.tail.y), (0, 11))
+        self.assertEqual(len(rope.previous_tail_positions), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,25 @@
-from queue import Queue
-from typing import List
+import struct
+import zlib
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
 
 from utils.out import print
-from utils.readers import OneColumnFileReader
+from utils.readers import FileReader
+
+# Opcodes, each instruction being stored as an opcode followed by its operand
+NOOP = 0
+ADDX = 1
 
-NOOP = object()
+# Number of cycles taken by each opcode
+CYCLES = np.array([1, 2], dtype=np.int64)
 
+# Cycles during which the signal strength is sampled
+SAMPLED_CYCLES = range(20, 221, 40)
 
-class OperationReader(OneColumnFileReader):
+
+class OperationReader(FileReader):
     """
     Implementation of an operation reader
 
@@ -16,71 +28,203 @@ class OperationReader(OneColumnFileReader):
     noop
     addx 3
     addx -5
+
+    ->
+    array("i", [NOOP, 0, ADDX, 3, ADDX, -5])
     """
 
-    def read(self, *args):
-        data = super(OperationReader, self).read()
-        result = Queue()
-        for row in data:
-            if row == "noop":
-                result.put(NOOP)
-            else:
-                result.put(int(row.split(" ")[1]))
+    def read(self, *args) -> array:
+        """
+        Implementation of an operation file read function, the instructions being
+        rewritten as opcodes and operands then parsed at once
+        """
+        with open(self.file, "rb") as f:
+            data = f.read()
+        data = data.replace(b"noop", b"%d 0" % NOOP).replace(b"addx", b"%d" % ADDX)
 
-        return result
+        program = np.fromstring(data, dtype=np.int32, sep=" ")
+        opcodes = program[0::2]
+        assert (
+            len(program) % 2 == 0 and ((opcodes == NOOP) | (opcodes == ADDX)).all()
+        ), f"Cannot parse program {self.file}"
+        return array("i", program.tobytes())
 
 
-def execute(data: Queue):
-    x_history = []
-    x = 1
-    while not data.empty():
-        operation = data.get()
-        if operation == NOOP:
-            x_history.append(x)
-            continue
+def decode(program: array) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Given a program, return views of its opcodes and operands
+    """
+    instructions = np.frombuffer(program, dtype=np.int32).reshape(-1, 2)
+    return instructions[:, 0], instructions[:, 1]
 
-        x_history.append(x)
-        x_history.append(x)
-        x += operation
 
-    x_history.append(x)
+def execute(program: array) -> np.ndarray:
+    """
+    Given a program, return the value of X during each cycle, followed by its final
+    value.
 
-    cycles = [20, 60, 100, 140, 180, 220]
-    signal_strength = []
-    for index in cycles:
-        signal_strength.append(x_history[index - 1] * index)
+    X only changes at the end of the instructions, its value during the cycles of each
+    instruction is the cumulative sum of the previous operands.
+    """
+    opcodes, operands = decode(program)
+    x_after = 1 + np.cumsum(operands, dtype=np.int64)
+    x_before = x_after - operands
+    return np.append(
+        np.repeat(x_before, CYCLES[opcodes]), 1 + operands.sum(dtype=np.int64)
+    )
 
-    return x_history, signal_strength
 
+def timeline(program: array) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Given a program, return the cycle at which each instruction ends, and the value of
+    X after each instruction, preceded by its initial value
+    """
+    opcodes, operands = decode(program)
+    ends = np.cumsum(CYCLES[opcodes])
+    x_values = np.empty(len(operands) + 1, dtype=np.int64)
+    x_values[0] = 1
+    np.cumsum(operands, out=x_values[1:])
+    x_values[1:] += 1
+    return ends, x_values
 
-def draw(x_history: List[int]):
-    result_raw = []
-    result = []
-    index = 0
-    for y in range(0, 6):
-        row = []
-        for x in range(0, 40):
-            signal = x_history[index]
-            index += 1
-            if signal - 1 == x or signal == x or signal + 1 == x:
-                row.append("##")
-            else:
-                row.append("  ")
-        result_raw.append(row)
-        result.append("".join(row))
 
-    print("\n".join(result))
+def sample_x(program: array, cycles: Iterable[int]) -> np.ndarray:
+    """
+    Given a program and cycles, return the value of X during each of the cycles.
 
+    X during a cycle is its value after the instructions ended before it, found by
+    binary search in the instructions end cycles, so memory does not grow with the
+    number of cycles.
+    """
+    ends, x_values = timeline(program)
+    return x_during(ends, x_values, np.fromiter(cycles, dtype=np.int64))
 
-def main():
-    mini_test_reader = OperationReader("input-mini-test.txt")
-    mini_test_data = mini_test_reader.read()
 
-    test_reader = OperationReader("input-test.txt")
-    test_data = test_reader.read()
+def x_during(ends: np.ndarray, x_values: np.ndarray, cycles: np.ndarray) -> np.ndarray:
+    """
+    Given a program timeline and cycles, return the value of X during each of the
+    cycles
+    """
+    return x_values[np.searchsorted(ends, cycles - 1, side="right")]
+
+
+def compute_signal_strengths(
+    program: array,
+    cycles: Optional[Iterable[int]] = None,
+    stride: Optional[int] = None,
+    start: int = 20,
+) -> np.ndarray:
+    """
+    Given a program, return the signal strength during the given cycles, or during
+    every stride cycles from start up to the end of the program, or during the
+    SAMPLED_CYCLES by default.
+    """
+    if stride is not None:
+        total = int(CYCLES[decode(program)[0]].sum())
+        cycles = range(start, total + 1, stride)
+    elif cycles is None:
+        cycles = SAMPLED_CYCLES
+    cycles = np.fromiter(cycles, dtype=np.int64)
+    return cycles * sample_x(program, cycles)
+
 
-    reader = OperationReader("input.txt")
-    prod_data = reader.read()
+def render(x_history: np.ndarray, width: int = 40, height: int = 6) -> np.ndarray:
+    """
+    Given an X history, return the complete frames drawn by the CRT, as a (frames,
+    height, width) array of the pixels lit by the sprite.
+
+    The sprite is lit on the pixels of the columns X - 1 to X + 1, all the pixels are
+    compared at once with their column index.
+    """
+    size = width * height
+    frames = len(x_history) // size
+    sprites = np.asarray(x_history[: frames * size]).reshape(frames, height, width)
+    return np.abs(sprites - np.arange(width)) <= 1
+
+
+def iter_frames(
+    program: array, width: int = 40, height: int = 6, batch: int = 1024
+) -> Iterator[np.ndarray]:
+    """
+    Given a program, lazily yield its complete frames by batches of at most batch
+    frames, the X history of a single batch being computed at once.
+    """
+    ends, x_values = timeline(program)
+    total = int(ends[-1]) if len(ends) else 0
+    size = width * height
+    for start in range(0, total - total % size, size * batch):
+        cycles = np.arange(start + 1, min(start + size * batch, total) + 1)
+        yield render(x_during(ends, x_values, cycles), width, height)
+
+
+def to_text(frame: np.ndarray, lit: str = "##", dark: str = "  ") -> str:
+    """
+    Given a frame, return it as text, each pixel being drawn as lit or dark
+    """
+    assert len(lit) == len(dark), "Lit and dark pixels must have the same width"
+    pixels = np.array([list(dark.encode()), list(lit.encode())], dtype=np.uint8)
+    rows = pixels[frame.astype(np.intp)].reshape(frame.shape[0], -1)
+    rows = np.concatenate((rows, np.full((len(rows), 1), ord("\n"), np.uint8)), axis=1)
+    return rows.tobytes().decode()[:-1]
+
+
+def to_pbm(frame: np.ndarray) -> bytes:
+    """
+    Given a frame, return it as a binary PBM image, lit pixels being black
+    """
+    height, width = frame.shape
+    return b"P4\n%d %d\n" % (width, height) + np.packbits(frame, axis=1).tobytes()
+
+
+def to_png(frame: np.ndarray) -> bytes:
+    """
+    Given a frame, return it as a black and white PNG image, lit pixels being black
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    height, width = frame.shape
+    rows = np.packbits(~frame, axis=1)
+    # Each row starts with its filter type, 0 for none
+    raw = np.concatenate((np.zeros((height, 1), np.uint8), rows), axis=1).tobytes()
+    header = struct.pack(">IIBBBBB", width, height, 1, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def draw(x_history: np.ndarray, width: int = 40, height: int = 6) -> str:
+    """
+    Given an X history, return the first frame drawn by the CRT as text
+    """
+    return to_text(render(x_history, width, height)[0])
+
+
+def parse(file: str) -> array:
+    return OperationReader(file).cached_read()
+
+
+def part1(data: array) -> int:
+    return int(compute_signal_strengths(data).sum())
+
+
+def part2(data: array) -> str:
+    return draw(execute(data))
+
+
+def main():
+    mini_test_data = parse("input-mini-test.txt")
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
 
     data_sources = (
         # ("Mini test data", mini_test_data),
@@ -89,9 +233,8 @@ def main():
     )
 
     for data_source_name, data_source in data_sources:
-        x_history, signal_strength = execute(data_source)
-        print(f"Day 1 - Result 1 - {data_source_name}: {sum(signal_strength)}")
-        draw(x_history)
+        print(f"Day 1 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(part2(data_source))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from array import array
+
+import numpy as np
+from main import (
+    ADDX,
+    NOOP,
+    SAMPLED_CYCLES,
+    OperationReader,
+    compute_signal_strengths,
+    execute,
+    iter_frames,
+    render,
+    sample_x,
+    to_pbm,
+    to_png,
+)
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def read(content: str) -> array:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(content)
+    try:
+        return OperationReader(f.name).read()
+    finally:
+        os.remove(f.name)
+
+
+def load(name: str) -> array:
+    return OperationReader(os.path.join(DIRECTORY, name)).read()
+
+
+def decode_pbm(image: bytes) -> np.ndarray:
+    """
+    Given a binary PBM image, return its pixels, black ones being set
+    """
+    magic, size, pixels = image.split(b"\n", 2)
+    assert magic == b"P4"
+    width, height = map(int, size.split())
+    rows = np.frombuffer(pixels, dtype=np.uint8).reshape(height, -1)
+    return np.unpackbits(rows, axis=1)[:, :width].astype(bool)
+
+
+def decode_png(image: bytes) -> np.ndarray:
+    """
+    Given a black and white unfiltered PNG image, return its pixels, black ones being
+    set
+    """
+    assert image[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    chunks = {}
+    while position < len(image):
+        (length,) = struct.unpack(">I", image[position : position + 4])
+        kind = image[position + 4 : position + 8]
+        data = image[position + 8 : position + 8 + length]
+        (crc,) = struct.unpack(
+            ">I", image[position + 8 + length : position + 12 + length]
+        )
+        assert crc == zlib.crc32(kind + data), f"Bad {kind} chunk checksum"
+        chunks[kind] = chunks.get(kind, b"") + data
+        position += 12 + length
+
+    width, height, depth, color = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color) == (1, 0) and b"IEND" in chunks
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    rows = rows.reshape(height, -1)
+    assert (rows[:, 0] == 0).all(), "Filtered rows"
+    return ~np.unpackbits(rows[:, 1:], axis=1)[:, :width].astype(bool)
+
+
+class TestCpu(unittest.TestCase):
+    def test_read(self):
+        program = load("input-mini-test.txt")
+        self.assertEqual(program, array("i", [NOOP, 0, ADDX, 3, ADDX, -5]))
+        self.assertEqual(read("addx -12\r\nnoop\n\n"), array("i", [ADDX, -12, NOOP, 0]))
+        self.assertEqual(read(""), array("i"))
+
+    def test_read_malformed(self):
+        for content in ("addx\n", "noop 5\n", "addx 3 4\n", "2 3\n", "addx 1\n3 0"):
+            with self.subTest(content=content):
+                with self.assertRaises(AssertionError):
+                    read(content)
+
+    def test_execute(self):
+        # X during the 5 cycles of the mini program, then after it
+        self.assertEqual(
+            execute(load("input-mini-test.txt")).tolist(), [1, 1, 1, 4, 4, -1]
+        )
+        self.assertEqual(execute(array("i")).tolist(), [1])
+
+        x_history = execute(load("input-test.txt"))
+        self.assertEqual(len(x_history), 241)
+        expected = {20: 21, 60: 19, 100: 18, 140: 21, 180: 16, 220: 18}
+        for cycle, x in expected.items():
+            with self.subTest(cycle=cycle):
+                self.assertEqual(x_history[cycle - 1], x)
+
+    def test_sample_x(self):
+        program = load("input-test.txt")
+        x_history = execute(program)
+        cycles = range(1, 241)
+        self.assertEqual(sample_x(program, cycles).tolist(), x_history[:-1].tolist())
+
+        # Before the first cycle X is its initial value, after the last one its final
+        self.assertEqual(sample_x(program, [0]).tolist(), [1])
+        self.assertEqual(sample_x(program, [241, 1000]).tolist(), [x_history[-1]] * 2)
+
+    def test_signal_strengths(self):
+        program = load("input-test.txt")
+        expected = [420, 1140, 1800, 2940, 2880, 3960]
+        self.assertEqual(compute_signal_strengths(program).tolist(), expected)
+        self.assertEqual(list(SAMPLED_CYCLES), [20, 60, 100, 140, 180, 220])
+        self.assertEqual(
+            compute_signal_strengths(program, stride=40).tolist(), expected
+        )
+        self.assertEqual(
+            compute_signal_strengths(program, [20, 220]).tolist(), [420, 3960]
+        )
+
+        x_history = execute(program)
+        strengths = compute_signal_strengths(program, stride=7, start=3)
+        cycles = range(3, 241, 7)
+        self.assertEqual(
+            strengths.tolist(), [cycle * x_history[cycle - 1] for cycle in cycles]
+        )
+        self.assertEqual(compute_signal_strengths(array("i"), stride=1).tolist(), [])
+
+    def test_iter_frames(self):
+        # 7 frames of 40 x 6 pixels, 21 of 20 x 4 pixels
+        program = load("input-test.txt") * 7
+        x_history = execute(program)
+        for width, height, batch in ((40, 6, 3), (20, 4, 4), (40, 6, 100)):
+            with self.subTest(width=width, height=height, batch=batch):
+                expected = render(x_history, width, height)
+                batches = list(iter_frames(program, width, height, batch))
+                self.assertTrue(all(len(frames) <= batch for frames in batches))
+                np.testing.assert_array_equal(np.concatenate(batches), expected)
+
+        self.assertEqual(list(iter_frames(array("i"))), [])
+
+    def test_images(self):
+        frames = render(execute(load("input-test.txt") * 3), width=13, height=6)
+        for frame in (*frames, frames[0][:, :8], frames[0][:1]):
+            with self.subTest(shape=frame.shape):
+                np.testing.assert_array_equal(decode_pbm(to_pbm(frame)), frame)
+                np.testing.assert_array_equal(decode_png(to_png(frame)), frame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,41 @@ from collections import Counter
 from collections import deque
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Callable, Deque, Dict, Optional
+from typing import Callable, Deque, Dict, List, Optional
 
 from math import floor, lcm
 
+import numpy as np
+
+ADD = "add"
+MULTIPLY = "multiply"
+SQUARE = "square"
+
+
+@dataclass(frozen=True)
+class Operation:
+    """
+    Worry level operation of a monkey, applied to a single worry level or to an array
+    of them
+    """
+
+    kind: str
+    value: int = 0
+
+    def __call__(self, x):
+        if self.kind == ADD:
+            return x + self.value
+        if self.kind == MULTIPLY:
+            return x * self.value
+        if self.kind == SQUARE:
+            return x * x
+        raise ValueError(f"Unknown operation {self.kind}")
+
 
 @dataclass
 class Monkey:
     items: Deque[int]
-    operation: Callable
+    operation: Operation
     test_value: int
     test_true: int
     test_false: int
@@ -40,28 +66,28 @@ def test_monkeys():
     return {
         0: Monkey(
             items=monkey_0_queue,
-            operation=lambda x: x * 19,
+            operation=Operation(MULTIPLY, 19),
             test_value=23,
             test_true=2,
             test_false=3,
         ),
         1: Monkey(
             items=monkey_1_queue,
-            operation=lambda x: x + 6,
+            operation=Operation(ADD, 6),
             test_value=19,
             test_true=2,
             test_false=0,
         ),
         2: Monkey(
             items=monkey_2_queue,
-            operation=lambda x: x * x,
+            operation=Operation(SQUARE),
             test_value=13,
             test_true=1,
             test_false=3,
         ),
         3: Monkey(
             items=monkey_3_queue,
-            operation=lambda x: x + 3,
+            operation=Operation(ADD, 3),
             test_value=17,
             test_true=0,
             test_false=1,
@@ -106,56 +132,56 @@ def prod_monkeys():
     return {
         0: Monkey(
             items=monkey_0_queue,
-            operation=lambda x: x * 3,
+            operation=Operation(MULTIPLY, 3),
             test_value=5,
             test_true=2,
             test_false=7,
         ),
         1: Monkey(
             items=monkey_1_queue,
-            operation=lambda x: x + 7,
+            operation=Operation(ADD, 7),
             test_value=2,
             test_true=3,
             test_false=6,
         ),
         2: Monkey(
             items=monkey_2_queue,
-            operation=lambda x: x + 5,
+            operation=Operation(ADD, 5),
             test_value=13,
             test_true=5,
             test_false=4,
         ),
         3: Monkey(
             items=monkey_3_queue,
-            operation=lambda x: x + 8,
+            operation=Operation(ADD, 8),
             test_value=19,
             test_true=6,
             test_false=0,
         ),
         4: Monkey(
             items=monkey_4_queue,
-            operation=lambda x: x + 4,
+            operation=Operation(ADD, 4),
             test_value=11,
             test_true=3,
             test_false=1,
         ),
         5: Monkey(
             items=monkey_5_queue,
-            operation=lambda x: x * 2,
+            operation=Operation(MULTIPLY, 2),
             test_value=3,
             test_true=4,
             test_false=1,
         ),
         6: Monkey(
             items=monkey_6_queue,
-            operation=lambda x: x + 6,
+            operation=Operation(ADD, 6),
             test_value=7,
             test_true=7,
             test_false=0,
         ),
         7: Monkey(
             items=monkey_7_queue,
-            operation=lambda x: x * x,
+            operation=Operation(SQUARE),
             test_value=17,
             test_true=2,
             test_false=5,
@@ -186,12 +212,134 @@ def do_round(
     return monkeys
 
 
+def process_modular(monkeys: Dict[int, Monkey], rounds: int) -> Counter:
+    """
+    Given monkeys and a number of rounds, return the monkey activity when worry
+    levels are only kept modulo the lcm of the monkey test values.
+
+    The items of each monkey are kept in int64 arrays, so that a monkey turn is a few
+    vectorized operations on all its items. Items thrown to a monkey are only
+    concatenated once its turn comes.
+    """
+    base = lcm(*(monkey.test_value for monkey in monkeys.values()))
+    # Worry levels are squared before being reduced
+    assert base < 2**31, f"Modulus {base} too large for int64 worry levels"
+
+    pending = {
+        monkey_id: [np.array(monkey.items, dtype=np.int64)]
+        for monkey_id, monkey in monkeys.items()
+    }
+    activity = dict.fromkeys(monkeys, 0)
+    for _ in range(rounds):
+        for monkey_id, monkey in monkeys.items():
+            thrown = pending[monkey_id]
+            if not thrown:
+                continue
+            items = np.concatenate(thrown) if len(thrown) > 1 else thrown[0]
+            pending[monkey_id] = []
+            activity[monkey_id] += len(items)
+
+            items = monkey.operation(items)
+            items %= base
+            divisible = items % monkey.test_value == 0
+            pending[monkey.test_true].append(items[divisible])
+            pending[monkey.test_false].append(items[~divisible])
+
+    return Counter(activity)
+
+
+def follow_item(
+    monkeys: Dict[int, Monkey], base: int, monkey_id: int, worry: int, rounds: int
+) -> Counter:
+    """
+    Given monkeys, the lcm of their test values, the monkey holding an item, its worry
+    level and a number of rounds, return the number of inspections of this item by
+    each monkey.
+
+    Items do not interact under the lcm modulus, and an item (monkey, worry level)
+    state at the start of a round determines the following ones. Once a state repeats,
+    the inspections of the remaining rounds are counted from the cycle in closed form.
+    """
+    order = {monkey_id: index for index, monkey_id in enumerate(monkeys)}
+    seen = {}
+    # Monkeys inspecting the item during each round
+    history: List[List[int]] = []
+    state = (monkey_id, worry)
+    while len(history) < rounds and state not in seen:
+        seen[state] = len(history)
+        holder, worry = state
+        inspections = []
+        while True:
+            inspections.append(holder)
+            monkey = monkeys[holder]
+            worry = monkey.operation(worry) % base
+            if worry % monkey.test_value == 0:
+                target = monkey.test_true
+            else:
+                target = monkey.test_false
+            # Monkeys after the holder play later in the same round
+            if order[target] <= order[holder]:
+                break
+            holder = target
+        history.append(inspections)
+        state = (target, worry)
+
+    activity = Counter()
+    cycle_start = seen.get(state, len(history))
+    for inspections in history[:cycle_start]:
+        activity.update(inspections)
+
+    cycle = history[cycle_start:]
+    if cycle:
+        repeats, remainder = divmod(rounds - cycle_start, len(cycle))
+        for index, inspections in enumerate(cycle):
+            count = repeats + (index < remainder)
+            for holder in inspections:
+                activity[holder] += count
+
+    return activity
+
+
+def process_cycles(monkeys: Dict[int, Monkey], rounds: int) -> Counter:
+    """
+    Given monkeys and a number of rounds, return the monkey activity when worry
+    levels are only kept modulo the lcm of the monkey test values, following each
+    item until its trajectory repeats.
+    """
+    base = lcm(*(monkey.test_value for monkey in monkeys.values()))
+    monkey_activity = Counter(dict.fromkeys(monkeys, 0))
+    for monkey_id, monkey in monkeys.items():
+        for worry in monkey.items:
+            monkey_activity.update(follow_item(monkeys, base, monkey_id, worry, rounds))
+    return monkey_activity
+
+
+# Engines computing the monkey activity when worry levels are kept modulo the lcm
+ENGINES: Dict[str, Callable[[Dict[int, Monkey], int], Counter]] = {
+    "cycles": process_cycles,
+    "arrays": process_modular,
+}
+
+
 def process(
-    monkeys: Dict[int, Monkey], worry_division: Optional[Callable], rounds: int
+    monkeys: Dict[int, Monkey],
+    worry_division: Optional[Callable],
+    rounds: int,
+    engine: str = "cycles",
 ):
+    """
+    Given monkeys, a worry division and a number of rounds, return the product of the
+    two highest monkey activities. Without worry division, worry levels are kept
+    modulo the lcm of the monkey test values by the given engine.
+    """
     if worry_division is None:
-        base = lcm(*(monkey.test_value for monkey in monkeys.values()))
-        worry_division = lambda x: x % base
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine {engine}, available: {', '.join(ENGINES)}"
+            )
+        monkey_activity = ENGINES[engine](monkeys, rounds)
+        top_two = monkey_activity.most_common(2)
+        return top_two[0][1] * top_two[1][1]
 
     monkey_activity = Counter()
     for _ in range(1, rounds + 1):
@@ -201,6 +349,21 @@ def process(
     return top_two[0][1] * top_two[1][1]
 
 
+def load(name: str) -> Dict[int, Monkey]:
+    monkeys = {"test": test_monkeys, "prod": prod_monkeys}
+    if name not in monkeys:
+        raise ValueError(f"Unknown input {name}, available: {', '.join(monkeys)}")
+    return monkeys[name]()
+
+
+def part1(monkeys: Dict[int, Monkey]) -> int:
+    return process(deepcopy(monkeys), worry_division=lambda x: floor(x / 3), rounds=20)
+
+
+def part2(monkeys: Dict[int, Monkey], engine: str = "cycles") -> int:
+    return process(monkeys, worry_division=None, rounds=10000, engine=engine)
+
+
 def main():
     data_sources = (
         ("Test data", test_monkeys()),
@@ -208,12 +371,8 @@ def main():
     )
 
     for data_source_name, data_source in data_sources:
-        print(
-            f"Day 11 - Result 1 - {data_source_name}: {process(deepcopy(data_source), worry_division=lambda x: floor(x/3), rounds=20)}"
-        )
-        print(
-            f"Day 11 - Result 2 - {data_source_name}: {process(deepcopy(data_source), worry_division=None, rounds=10000)}"
-        )
+        print(f"Day 11 - Result 1 - {data_source_name}: {part1(data_source)}")
+        print(f"Day 11 - Result 2 - {data_source_name}: {part2(data_source)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import unittest
+from collections import Counter
+from copy import deepcopy
+from math import lcm
+from main import ENGINES, do_round, follow_item, load, process
+
+ROUNDS = (1, 2, 3, 7, 20, 333, 1001)
+
+
+def process_rounds(monkeys, rounds: int) -> Counter:
+    """
+    Given monkeys and a number of rounds, return the monkey activity, playing each
+    round with worry levels kept modulo the lcm of the monkey test values
+    """
+    monkeys = deepcopy(monkeys)
+    base = lcm(*(monkey.test_value for monkey in monkeys.values()))
+    monkey_activity = Counter(dict.fromkeys(monkeys, 0))
+    for _ in range(rounds):
+        do_round(monkeys, monkey_activity, worry_division=lambda x: x % base)
+    return monkey_activity
+
+
+class TestMonkeys(unittest.TestCase):
+    def test_engines(self):
+        for name in ("test", "prod"):
+            monkeys = load(name)
+            for rounds in ROUNDS:
+                expected = process_rounds(monkeys, rounds)
+                for engine, run in ENGINES.items():
+                    with self.subTest(input=name, rounds=rounds, engine=engine):
+                        self.assertEqual(run(monkeys, rounds), expected)
+
+    def test_follow_item(self):
+        monkeys = load("test")
+        base = lcm(*(monkey.test_value for monkey in monkeys.values()))
+        for rounds in ROUNDS:
+            with self.subTest(rounds=rounds):
+                single = deepcopy(monkeys)
+                for monkey in single.values():
+                    monkey.items.clear()
+                single[1].items.append(54)
+                expected = +process_rounds(single, rounds)
+                self.assertEqual(follow_item(monkeys, base, 1, 54, rounds), expected)
+
+    def test_process(self):
+        monkeys = load("test")
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(process(monkeys, None, 10000, engine), 2713310158)
+        with self.assertRaises(ValueError):
+            process(monkeys, None, 20, "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
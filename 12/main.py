@@ -5,10 +5,9 @@ from typing import List, Tuple, Optional
 import networkx as nx
 from networkx import dfs_predecessors, shortest_path
 
-from utils.out import print
+from utils.out import DEBUG, print
 from utils.readers import OneColumnFileReader
 import numpy as np
-import matplotlib.pyplot as plt
 
 class Coord:
     pass
@@ -131,7 +130,10 @@ def already_in_node(graph, start: Coord, current: Coord, next:Coord):
 
     return False
 
-def explore(map, start, graph, current_node):
+def explore(map, start, graph, current_node, found: Optional[List[int]] = None):
+    if found is None:
+        found = []
+
     nodes = [
         current_node.north(map),
         current_node.south(map),
@@ -150,17 +152,44 @@ def explore(map, start, graph, current_node):
                 add_to_graph(graph, current_node, next, direction)
                 if next.is_end:
                     shortest = shortest_path(graph, start, next)
-                    print(f"Found path {len(shortest) - 1}")
-                    return
-                explore(map, start, graph, next)
+                    print(f"Found path {len(shortest) - 1}", level=DEBUG)
+                    found.append(len(shortest) - 1)
+                    return found
+                explore(map, start, graph, next, found)
+
+    return found
+
+
+def parse(file: str):
+    return MapReader(file).cached_read()
+
+
+def search(data) -> Tuple[nx.Graph, List[int]]:
+    """
+    Given a parsed map, explore it from the start and return the exploration graph
+    with the length of the paths found
+    """
+    graph = nx.Graph()
+    start = deepcopy(data[1])
+    start.parent = (0, 0)
+    graph.add_node(start)
+    try:
+        found = explore(data[0], start, graph, start)
+    except RecursionError:
+        raise ValueError("Map too large for the recursive exploration") from None
+    return graph, found
+
+
+def part1(data) -> Optional[int]:
+    graph, found = search(data)
+    return min(found, default=None)
 
 
 def main():
-    test_reader = MapReader("input-test.txt")
-    test_data = test_reader.read()
+    import matplotlib.pyplot as plt
 
-    reader = MapReader("input.txt")
-    prod_data = reader.read()
+    test_data = parse("input-test.txt")
+    prod_data = parse("input.txt")
 
     data_sources = (
         ("Test data", test_data),
@@ -168,12 +197,7 @@ def main():
     )
 
     for data_source_name, data_source in data_sources:
-        graph = nx.Graph()
-        start = deepcopy(data_source[1])
-        start.parent = (0,0)
-        graph.add_node(start)
-        explore(data_source[0], start, graph, start)
-
+        graph, found = search(data_source)
 
         pos = nx.spring_layout(graph)
         plt.figure(figsize=(10, 10))
@@ -0,0 +1,280 @@
+"""
+Synthetic puzzle input generators
+
+E.g.
+
+python -m aoc generate 8 --size 5000 --seed 1 -o 08/input-large.txt
+python -m aoc generate 5 --size 100000 -p stacks=2000 -p max_move=500
+
+Each generator takes a size (lines, records or grid side depending on the day), a
+seeded random.Random and optional integer keyword arguments (-p NAME=VALUE on the
+command line), and yields the input lines one by one so that inputs larger than
+memory can be written. Day 11 has no generator as its monkeys are hard coded.
+"""
+
+import random
+import string
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, TextIO
+
+LETTERS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def symbols(count: int) -> List[str]:
+    """
+    Return count distinct printable characters, ascii letters first
+    """
+    result = list(LETTERS + string.digits)[:count]
+    code_point = 0x100
+    while len(result) < count:
+        result.append(chr(code_point))
+        code_point += 1
+    return result
+
+
+def generate_01(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    size calorie lines, grouped by elf
+    """
+    written = 0
+    while written < size:
+        if written:
+            yield ""
+        for _ in range(min(rng.randint(1, 15), size - written)):
+            yield str(rng.randint(1000, 60000))
+            written += 1
+
+
+def generate_02(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    size rounds
+    """
+    for _ in range(size):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+
+
+def generate_03(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    size rucksacks (rounded up to a group of 3), each with a single item shared by its
+    two compartments and a single badge per group.
+    """
+    for _ in range(0, size, 3):
+        letters = list(LETTERS)
+        rng.shuffle(letters)
+        badge, others = letters[0], letters[1:]
+        for pool in (others[0:17], others[17:34], others[34:51]):
+            common = rng.choice(pool)
+            left_only = [x for x in pool[: len(pool) // 2] if x != common]
+            right_only = [x for x in pool[len(pool) // 2 :] if x != common]
+            # The badge lives in the left compartment, unless it is the common item
+            if rng.random() < 0.2:
+                common = badge
+            else:
+                left_only.append(badge)
+
+            half = rng.randint(4, 24)
+            left = [common, badge] if common != badge else [common]
+            left += rng.choices(left_only, k=half - len(left))
+            right = [common] + rng.choices(right_only, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            yield "".join(left) + "".join(right)
+
+
+def generate_04(size: int, rng: random.Random, max_section: int = 99) -> Iterator[str]:
+    """
+    size assignment pairs, with sections between 1 and max_section
+    """
+    for _ in range(size):
+        pair = []
+        for _ in range(2):
+            low = rng.randint(1, max_section)
+            high = rng.randint(low, min(max_section, low + max_section // 3))
+            pair.append(f"{low}-{high}")
+        yield ",".join(pair)
+
+
+def generate_05(
+    size: int,
+    rng: random.Random,
+    stacks: int = 9,
+    height: int = 8,
+    max_move: int = 10,
+) -> Iterator[str]:
+    """
+    A drawing of stacks stacks of height crates, followed by size valid instructions
+    moving at most max_move crates at a time.
+    """
+    crates = [
+        [rng.choice(string.ascii_uppercase) for _ in range(height)]
+        for _ in range(stacks)
+    ]
+    for level in reversed(range(height)):
+        yield " ".join(f"[{stack[level]}]" for stack in crates)
+    yield "".join(f" {label:<3}" for label in range(1, stacks + 1)).rstrip()
+    yield ""
+
+    heights = [height] * stacks
+    for _ in range(size):
+        origin = rng.randrange(stacks)
+        while not heights[origin]:
+            origin = rng.randrange(stacks)
+        destination = rng.randrange(stacks - 1)
+        if destination >= origin:
+            destination += 1
+        number = rng.randint(1, min(heights[origin], max_move))
+        heights[origin] -= number
+        heights[destination] += number
+        yield f"move {number} from {origin + 1} to {destination + 1}"
+
+
+def generate_06(size: int, rng: random.Random, window_size: int = 14) -> Iterator[str]:
+    """
+    A single line stream of size characters where the first window of window_size
+    distinct characters is at the very end. The first window of any smaller size
+    above 3 ends within the last window_size characters.
+    """
+    alphabet = symbols(max(window_size, 3))
+    prefix = alphabet[:3]
+    remaining = size - window_size
+    chunks = []
+    while remaining > 0:
+        chunk = min(remaining, 1 << 16)
+        chunks.append("".join(rng.choices(prefix, k=chunk)))
+        remaining -= chunk
+    suffix = alphabet[:window_size]
+    rng.shuffle(suffix)
+    # Avoid the first suffix characters forming an early window with the prefix
+    suffix.sort(key=lambda x: x not in prefix)
+    yield "".join(chunks) + "".join(suffix)
+
+
+def generate_07(
+    size: int,
+    rng: random.Random,
+    max_children: int = 3,
+    max_files: int = 5,
+    max_depth: int = 50,
+) -> Iterator[str]:
+    """
+    A terminal transcript exploring up to size directories depth first, up to
+    max_depth deep. The directory budget is consumed by the first branches, so trees
+    go deep first.
+    """
+    counter = 0
+
+    def listing(budget: int) -> List[str]:
+        nonlocal counter
+        children = []
+        for _ in range(min(rng.randint(1, max_children), budget)):
+            counter += 1
+            children.append(f"d{counter}")
+        return children
+
+    yield "$ cd /"
+    budget = size - 1
+    stack = []
+    children = listing(budget)
+    budget -= len(children)
+    while True:
+        yield "$ ls"
+        for child in children:
+            yield f"dir {child}"
+        for index in range(rng.randint(0, max_files)):
+            yield f"{rng.randint(1, 300000)} f{index}.txt"
+        stack.append(iter(children))
+
+        # Go to the next directory to list, depth first
+        while stack:
+            child = next(stack[-1], None)
+            if child is not None:
+                yield f"$ cd {child}"
+                break
+            stack.pop()
+            if stack:
+                yield "$ cd .."
+        if not stack:
+            return
+
+        children = listing(budget) if len(stack) < max_depth else []
+        budget -= len(children)
+
+
+def generate_08(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    A size x size tree map
+    """
+    for _ in range(size):
+        yield "".join(rng.choices(string.digits, k=size))
+
+
+def generate_09(size: int, rng: random.Random, max_count: int = 20) -> Iterator[str]:
+    """
+    size moves of at most max_count steps
+    """
+    for _ in range(size):
+        yield f"{rng.choice('RLUD')} {rng.randint(1, max_count)}"
+
+
+def generate_10(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    A program of size instructions
+    """
+    for _ in range(size):
+        if rng.random() < 0.3:
+            yield "noop"
+        else:
+            yield f"addx {rng.randint(-10, 10)}"
+
+
+def generate_12(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    A size wide, size / 2 high height map climbing from the west to the east
+    """
+    height = max(size // 2, 1)
+    for y in range(height):
+        row = []
+        for x in range(size):
+            level = x * 26 // size + rng.choice((-1, 0, 0, 1))
+            row.append(string.ascii_lowercase[min(max(level, 0), 25)])
+        if y == height // 2:
+            row[0] = "S"
+            row[-1] = "E"
+        yield "".join(row)
+
+
+GENERATORS: Dict[int, Callable[..., Iterator[str]]] = {
+    1: generate_01,
+    2: generate_02,
+    3: generate_03,
+    4: generate_04,
+    5: generate_05,
+    6: generate_06,
+    7: generate_07,
+    8: generate_08,
+    9: generate_09,
+    10: generate_10,
+    12: generate_12,
+}
+
+
+def generate(
+    day: int, size: int, seed: Optional[int] = None, **kwargs
+) -> Iterator[str]:
+    """
+    Given a day, a size and a seed, return the input lines
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No generator for day {day}, available: {sorted(GENERATORS)}")
+    return GENERATORS[day](size, random.Random(seed), **kwargs)
+
+
+def write(
+    day: int, size: int, seed: Optional[int] = None, out: TextIO = sys.stdout, **kwargs
+) -> None:
+    """
+    Given a day, a size and a seed, write the input to out
+    """
+    for line in generate(day, size, seed, **kwargs):
+        out.write(line)
+        out.write("\n")
@@ -0,0 +1,231 @@
+"""
+Unified puzzle runner
+
+E.g.
+
+python -m aoc list
+python -m aoc run 7 --part 2 --input prod
+python -m aoc generate 8 --size 5000 --seed 1 -o 08/input-large.txt
+python -m aoc generate 6 --size 100000 -p window_size=1000
+
+Days are discovered from the NN/main.py modules and only the selected one is
+imported. A day module exposes:
+
+- parse(file) returning the parsed input, or load(name) for days without input files
+- part1(data) and/or part2(data) returning the answers
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+from os.path import abspath, dirname, isfile, join
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = dirname(dirname(abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DAY_REGEX = re.compile(r"^\d\d$")
+INPUTS = {
+    "prod": "input.txt",
+    "test": "input-test.txt",
+    "mini-test": "input-mini-test.txt",
+}
+
+
+def discover_days() -> Dict[int, str]:
+    """
+    Return the path of each day main module, by day number
+    """
+    days = {}
+    for name in sorted(os.listdir(ROOT)):
+        path = join(ROOT, name, "main.py")
+        if DAY_REGEX.match(name) and isfile(path):
+            days[int(name)] = path
+    return days
+
+
+def load_day(day: int) -> ModuleType:
+    """
+    Given a day number, import its main module
+    """
+    name = f"day{day:02d}"
+    if name in sys.modules:
+        return sys.modules[name]
+
+    days = discover_days()
+    if day not in days:
+        raise ValueError(f"Unknown day {day}, available days: {sorted(days)}")
+
+    spec = importlib.util.spec_from_file_location(name, days[day])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_input(module: ModuleType, source: str) -> Any:
+    """
+    Given a day module and an input name (or path), return the parsed input
+    """
+    if hasattr(module, "parse"):
+        file = source
+        if not isfile(file):
+            if source not in INPUTS:
+                raise ValueError(f"Unknown input {source}")
+            file = join(dirname(module.__file__), INPUTS[source])
+        return module.parse(file)
+
+    if hasattr(module, "load"):
+        return module.load(source)
+
+    raise ValueError(f"{module.__name__} exposes neither parse nor load")
+
+
+def run_part(module: ModuleType, part: int, source: str) -> Tuple[Any, float, float]:
+    """
+    Given a day module, a part and an input, return the answer with the parse and
+    solve durations in seconds
+    """
+    solve = getattr(module, f"part{part}")
+
+    start = perf_counter()
+    data = load_input(module, source)
+    parsed = perf_counter()
+    answer = solve(data)
+    solved = perf_counter()
+
+    return answer, parsed - start, solved - parsed
+
+
+def run(day: int, parts: List[int], source: str) -> None:
+    """
+    Run and time the given parts of a day
+    """
+    from utils import out
+
+    module = load_day(day)
+    for part in parts:
+        if not hasattr(module, f"part{part}"):
+            print(f"Day {day:02d} - Part {part} - {source}: not implemented")
+            continue
+
+        answer, parse_time, solve_time = run_part(module, part, source)
+        out.flush()
+        answer = str(answer)
+        separator = "\n" if "\n" in answer else " "
+        print(
+            f"Day {day:02d} - Part {part} - {source}"
+            f" (parse {parse_time * 1000:.2f} ms, solve {solve_time * 1000:.2f} ms):"
+            f"{separator}{answer}"
+        )
+
+
+def generator_param(value: str) -> Tuple[str, int]:
+    """
+    Given a NAME=VALUE command line argument, return the generator keyword argument
+    """
+    name, separator, raw_value = value.partition("=")
+    try:
+        if not separator or not name.isidentifier():
+            raise ValueError
+        return name, int(raw_value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected NAME=INTEGER, got {value}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2022")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List the available days")
+
+    run_parser = commands.add_parser("run", help="Run a day")
+    run_parser.add_argument("day", type=int)
+    run_parser.add_argument("--part", type=int, choices=(1, 2))
+    run_parser.add_argument(
+        "--input",
+        default="prod",
+        help=f"One of {', '.join(INPUTS)} or a file path (default: prod)",
+    )
+    run_parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the parsed input cache"
+    )
+    verbosity = run_parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Output the days debug messages, -vv for their traces as well",
+    )
+    verbosity.add_argument(
+        "-q", "--quiet", action="store_true", help="Output the answers only"
+    )
+
+    generate_parser = commands.add_parser(
+        "generate", help="Generate a synthetic input for a day"
+    )
+    generate_parser.add_argument("day", type=int)
+    generate_parser.add_argument("--size", type=int, required=True)
+    generate_parser.add_argument("--seed", type=int)
+    generate_parser.add_argument(
+        "-o", "--output", help="Output file path (default: stdout)"
+    )
+    generate_parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        type=generator_param,
+        metavar="NAME=VALUE",
+        help="Integer keyword argument of the day generator, e.g. window_size=1000",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for day, path in discover_days().items():
+            print(f"{day:02d} {path}")
+        return
+
+    if args.command == "generate":
+        from aoc.generators import write
+
+        params = dict(args.param)
+        try:
+            if args.output is None:
+                write(args.day, args.size, args.seed, **params)
+            else:
+                with open(args.output, "w") as f:
+                    write(args.day, args.size, args.seed, out=f, **params)
+        except (ValueError, TypeError) as e:
+            parser.error(str(e))
+        return
+
+    if args.no_cache:
+        os.environ["AOC_CACHE"] = "0"
+
+    # The output level and writer are read from the environment on import
+    try:
+        from utils import out
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Traces would be timed along with the solvers, only output them on demand
+    if args.quiet:
+        out.set_level(out.QUIET)
+    elif args.verbose:
+        out.set_level(out.TRACE if args.verbose > 1 else out.DEBUG)
+    elif "AOC_LOG_LEVEL" not in os.environ:
+        out.set_level(out.INFO)
+
+    parts = [args.part] if args.part else [1, 2]
+    try:
+        run(args.day, parts, args.input)
+    except ValueError as e:
+        parser.error(str(e))
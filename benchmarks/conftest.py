@@ -0,0 +1,72 @@
+"""
+Shared fixtures of the benchmark suite
+
+The "scaled" input of a day is generated by aoc.generators, with a size of about
+AOC_BENCH_SCALE (10 by default) times the shipped input.
+"""
+import os
+import sys
+from os.path import abspath, dirname, join
+from typing import Callable, Dict
+
+import pytest
+
+ROOT = dirname(dirname(abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from aoc.generators import write  # noqa: E402
+from aoc.runner import INPUTS, load_day  # noqa: E402
+from utils import out  # noqa: E402
+
+SCALE = int(os.environ.get("AOC_BENCH_SCALE", 10))
+
+# Benchmark the solvers, not the rendering of their traces
+if "AOC_LOG_LEVEL" not in os.environ:
+    out.set_level(out.QUIET)
+
+
+# Scaled input size of each day, multiplied by AOC_BENCH_SCALE
+SIZES: Dict[int, int] = {
+    1: 2500,
+    2: 2500,
+    3: 300,
+    4: 1000,
+    5: 500,
+    6: 4096,
+    7: 200,
+    8: 100,
+    9: 2000,
+    10: 150,
+}
+
+
+@pytest.fixture(scope="session")
+def input_file(tmp_path_factory) -> Callable[[int, str], str]:
+    """
+    Return a function giving the input file of a day for a source, either one of the
+    shipped inputs or "scaled"
+    """
+    scaled_files = {}
+
+    def _input_file(day: int, source: str) -> str:
+        day_directory = join(ROOT, f"{day:02d}")
+        if source != "scaled":
+            return join(day_directory, INPUTS[source])
+
+        if day not in scaled_files:
+            path = tmp_path_factory.mktemp(f"day{day:02d}") / "input-scaled.txt"
+            with open(path, "w") as f:
+                write(day, SIZES[day] * SCALE, seed=day, out=f)
+            scaled_files[day] = str(path)
+        return scaled_files[day]
+
+    return _input_file
+
+
+@pytest.fixture(scope="session")
+def day() -> Callable[[int], object]:
+    """
+    Return the day module loader
+    """
+    return load_day
@@ -0,0 +1,260 @@
+"""
+Benchmarks of each day readers and solvers hot paths
+
+Run with
+
+python -m pytest benchmarks
+
+Results are saved as json in .benchmarks/, compare a run with the last saved one with
+
+python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import pytest
+
+SHIPPED = ("test", "prod")
+ALL = ("test", "prod", "scaled")
+
+
+def read(day, input_file, day_number, source, reader_name):
+    module = day(day_number)
+    return getattr(module, reader_name)(input_file(day_number, source))
+
+
+# Day 01
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_calories(benchmark, day, input_file, source):
+    reader = read(day, input_file, 1, source, "OneColumnFileReaderSpaceAware")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_combine_calories(benchmark, day, input_file, source):
+    module = day(1)
+    data = module.parse(input_file(1, source))
+    benchmark(module.combine_calories, data)
+
+
+# Day 02
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_strategy_guide(benchmark, day, input_file, source):
+    reader = read(day, input_file, 2, source, "StrategyGuideReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_scores(benchmark, day, input_file, source):
+    module = day(2)
+    data = module.parse(input_file(2, source))
+    benchmark(module.compute_scores, data)
+
+
+# Day 03
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_rucksacks(benchmark, day, input_file, source):
+    reader = read(day, input_file, 3, source, "RucksackReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_all_prio(benchmark, day, input_file, source):
+    module = day(3)
+    data = module.parse(input_file(3, source))
+    benchmark(module.compute_all_prio, data)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_badge_prio(benchmark, day, input_file, source):
+    module = day(3)
+    data = module.parse(input_file(3, source))
+    benchmark(module.compute_badge_prio, data)
+
+
+# Day 04
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_assignments(benchmark, day, input_file, source):
+    reader = read(day, input_file, 4, source, "AssignmentReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_check_for_fully_contains_sets(benchmark, day, input_file, source):
+    module = day(4)
+    data = module.parse(input_file(4, source))
+    benchmark(module.check_for_fully_contains_sets, data)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_check_for_intersection_sets(benchmark, day, input_file, source):
+    module = day(4)
+    data = module.parse(input_file(4, source))
+    benchmark(module.check_for_intersection_sets, data)
+
+
+# Day 05
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_crane_stack(benchmark, day, input_file, source):
+    reader = read(day, input_file, 5, source, "CraneStackReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+@pytest.mark.parametrize("solver", ("run", "run2"))
+def test_run(benchmark, day, input_file, source, solver):
+    module = day(5)
+    data = module.parse(input_file(5, source))
+    benchmark(getattr(module, solver), *data)
+
+
+@pytest.mark.parametrize("source", ALL)
+@pytest.mark.parametrize("keep_order", (False, True))
+def test_find_top_crates(benchmark, day, input_file, source, keep_order):
+    module = day(5)
+    data = module.parse(input_file(5, source))
+    benchmark(module.find_top_crates, *data, keep_order=keep_order)
+
+
+# Day 06
+
+
+@pytest.mark.parametrize("source", ALL)
+@pytest.mark.parametrize("window_size", (4, 14))
+def test_find_packet(benchmark, day, input_file, source, window_size):
+    module = day(6)
+    data = module.parse(input_file(6, source))
+    benchmark(module.find_packet, data, window_size)
+
+
+# Day 07
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_commands(benchmark, day, input_file, source):
+    reader = read(day, input_file, 7, source, "CommandReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_total_size_below(benchmark, day, input_file, source):
+    module = day(7)
+    root = module.parse(input_file(7, source))
+    benchmark(module.part1, root)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_smallest_above(benchmark, day, input_file, source):
+    module = day(7)
+    root = module.parse(input_file(7, source))
+    benchmark(module.part2, root)
+
+
+# Day 08
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_tree_map(benchmark, day, input_file, source):
+    reader = read(day, input_file, 8, source, "TreeMapReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_visible_tree_number(benchmark, day, input_file, source):
+    module = day(8)
+    tree_map = module.parse(input_file(8, source))
+    benchmark(module.compute_visible_tree_number, tree_map)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_best_scenic_score(benchmark, day, input_file, source):
+    module = day(8)
+    tree_map = module.parse(input_file(8, source))
+    benchmark(module.compute_best_scenic_score, tree_map)
+
+
+# Day 09
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_moves(benchmark, day, input_file, source):
+    reader = read(day, input_file, 9, source, "MoveReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_play1(benchmark, day, input_file, source):
+    module = day(9)
+    moves = module.parse(input_file(9, source))
+    benchmark(module.play1, moves)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_play2(benchmark, day, input_file, source):
+    module = day(9)
+    moves = module.parse(input_file(9, source))
+    benchmark(module.play2, moves)
+
+
+# Day 10
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_read_operations(benchmark, day, input_file, source):
+    reader = read(day, input_file, 10, source, "OperationReader")
+    benchmark(reader.read)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_execute(benchmark, day, input_file, source):
+    module = day(10)
+    data = module.parse(input_file(10, source))
+    benchmark(module.execute, data)
+
+
+@pytest.mark.parametrize("source", ALL)
+def test_compute_signal_strengths(benchmark, day, input_file, source):
+    module = day(10)
+    data = module.parse(input_file(10, source))
+    benchmark(module.compute_signal_strengths, data, stride=40)
+
+
+# Day 11, monkeys are hard coded, no scaled input
+
+
+@pytest.mark.parametrize("source", SHIPPED)
+@pytest.mark.parametrize("part", (1, 2))
+def test_process(benchmark, day, source, part):
+    module = day(11)
+    monkeys = module.load(source)
+    solver = getattr(module, f"part{part}")
+    benchmark.pedantic(solver, args=(monkeys,), rounds=5)
+
+
+@pytest.mark.parametrize("source", SHIPPED)
+@pytest.mark.parametrize("engine", ("cycles", "arrays"))
+def test_engines(benchmark, day, source, engine):
+    module = day(11)
+    monkeys = module.load(source)
+    benchmark.pedantic(module.part2, args=(monkeys, engine), rounds=5)
+
+
+# Day 12, the search is exponential, only the test input is practical
+
+
+def test_read_map(benchmark, day, input_file):
+    reader = read(day, input_file, 12, "test", "MapReader")
+    benchmark(reader.read)
+
+
+def test_search(benchmark, day, input_file):
+    module = day(12)
+    data = module.parse(input_file(12, "test"))
+    benchmark(module.search, data)
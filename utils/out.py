@@ -1,8 +1,144 @@
-from rich import print as _print
+"""
+Leveled console output
 
+E.g.
 
-def print(*args, **kwargs):
+if is_enabled(TRACE):
+    print(f"index {index}\n{display_stack(stack)}", level=TRACE)
+
+Messages below the current level are dropped before reaching the writer, guard the
+expensive ones with is_enabled so that their formatting is skipped as well.
+
+The level and the writer are read from the environment, and can be changed with
+set_level and set_writer:
+
+- AOC_LOG_LEVEL: one of trace (default), debug, info, warning or quiet
+- AOC_OUTPUT: rich (default) or plain, a buffered writer without rich formatting
+"""
+import atexit
+import os
+import sys
+from typing import Dict, List
+
+TRACE = 5
+DEBUG = 10
+INFO = 20
+WARNING = 30
+QUIET = 100
+
+LEVELS: Dict[str, int] = {
+    "trace": TRACE,
+    "debug": DEBUG,
+    "info": INFO,
+    "warning": WARNING,
+    "quiet": QUIET,
+}
+WRITERS = ("rich", "plain")
+
+# Number of characters buffered by the plain writer before being written
+BUFFER_SIZE = 1 << 16
+
+
+def parse_level(name: str) -> int:
+    """
+    Given a level name, return the level
+    """
+    if name.lower() not in LEVELS:
+        raise ValueError(f"Unknown level {name}, available: {', '.join(LEVELS)}")
+    return LEVELS[name.lower()]
+
+
+def check_writer(writer: str) -> str:
+    """
+    Given a writer name, return it if it is known
+    """
+    if writer not in WRITERS:
+        raise ValueError(f"Unknown writer {writer}, available: {', '.join(WRITERS)}")
+    return writer
+
+
+_level = parse_level(os.environ.get("AOC_LOG_LEVEL", "trace"))
+_writer = check_writer(os.environ.get("AOC_OUTPUT", "rich").lower())
+_buffer: List[str] = []
+_buffered = 0
+
+
+def set_level(level: int) -> None:
+    """
+    Set the minimum level of the messages to output, QUIET to output nothing
+    """
+    global _level
+    _level = level
+
+
+def get_level() -> int:
+    return _level
+
+
+def is_enabled(level: int) -> bool:
+    """
+    Given a level, return whether messages of this level are output
+    """
+    return level >= _level
+
+
+def set_writer(writer: str) -> None:
+    """
+    Set the writer, rich or plain
+    """
+    global _writer
+    check_writer(writer)
+    flush()
+    _writer = writer
+
+
+def flush() -> None:
+    """
+    Write the messages buffered by the plain writer
+    """
+    global _buffered
+    if _buffer:
+        sys.stdout.write("".join(_buffer))
+        sys.stdout.flush()
+        _buffer.clear()
+        _buffered = 0
+
+
+atexit.register(flush)
+
+
+def print(*args, level: int = INFO, sep: str = " ", end: str = "\n", **kwargs):
     """
     Workaround for https://youtrack.jetbrains.com/issue/PY-57706/Indentation-is-incorrect-when-Emulate-terminal-in-output-console-is-used
+
+    rich is imported on first use, so that importing a day does not pay for it. The
+    plain writer buffers the messages to stdout, and honours file and flush as the
+    builtin print does.
     """
-    return _print(*args, **kwargs, end="\r\n")
+    global _buffered
+    if level < _level:
+        return
+
+    if _writer == "plain":
+        file = kwargs.pop("file", None)
+        force_flush = kwargs.pop("flush", False)
+        if kwargs:
+            raise TypeError(f"Unexpected arguments {', '.join(kwargs)}")
+
+        message = sep.join(map(str, args)) + end
+        if file is not None and file is not sys.stdout:
+            flush()
+            file.write(message)
+            if force_flush:
+                file.flush()
+            return
+
+        _buffer.append(message)
+        _buffered += len(message)
+        if force_flush or _buffered >= BUFFER_SIZE:
+            flush()
+        return
+
+    from rich import print as _print
+
+    return _print(*args, sep=sep, end=end.replace("\n", "\r\n"), **kwargs)
@@ -1,5 +1,150 @@
-from os.path import isfile
-from typing import List, Any, Optional
+import codecs
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import sys
+from contextlib import contextmanager
+from os.path import abspath, dirname, getsize, isfile, join
+from typing import List, Any, Optional, Iterable, Iterator, Tuple
+
+CACHE_DIR = os.environ.get(
+    "AOC_CACHE_DIR", join(dirname(dirname(abspath(__file__))), ".cache")
+)
+CACHE_ENABLED = os.environ.get("AOC_CACHE", "1") != "0"
+CACHE_SIZE_LIMIT = int(os.environ.get("AOC_CACHE_SIZE_LIMIT", 256 << 20))
+
+# Content hash of the reader sources, by (path, size, mtime)
+_SOURCE_DIGESTS = {}
+
+
+class ParseCache:
+    """
+    On disk cache of parsed inputs.
+
+    Each entry is made of a json metadata file (source size, mtime and content hash)
+    and a payload file, either a .npy file for plain numpy arrays or a pickle
+    (protocol 5) for everything else. Least recently used entries are evicted once
+    the cache grows above its size limit.
+    """
+
+    def __init__(self, directory: str, size_limit: int) -> None:
+        self.directory = directory
+        self.size_limit = size_limit
+
+    def _path(self, key: str, extension: str) -> str:
+        return join(self.directory, f"{key}.{extension}")
+
+    def get(self, key: str, reader: "FileReader") -> Tuple[bool, Any]:
+        """
+        Given a key and the reader of the source file, return (hit, data)
+        """
+        meta_path = self._path(key, "json")
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        stat = os.stat(reader.file)
+        if meta["size"] != stat.st_size:
+            return False, None
+        if meta["mtime"] != stat.st_mtime_ns:
+            # Touched but maybe not modified, fall back on the content hash
+            if meta["digest"] != reader.digest():
+                return False, None
+            meta["mtime"] = stat.st_mtime_ns
+            self._write_meta(meta_path, meta)
+
+        try:
+            data = self._load(key, meta["format"])
+        except Exception:
+            return False, None
+
+        os.utime(meta_path)
+        return True, data
+
+    def put(self, key: str, reader: "FileReader", data: Any) -> None:
+        """
+        Given a key, the reader of the source file and its parsed data, store it.
+        Data that cannot be serialized is silently not cached.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stat = os.stat(reader.file)
+        data_format = "npy" if self._is_plain_array(data) else "pickle"
+        data_path = self._path(key, data_format)
+        temp_path = f"{data_path}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                if data_format == "npy":
+                    import numpy as np
+
+                    np.save(f, data, allow_pickle=False)
+                else:
+                    pickle.dump(data, f, protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            os.remove(temp_path)
+            return
+        os.replace(temp_path, data_path)
+        for extension in ("npy", "pickle"):
+            if extension != data_format and isfile(self._path(key, extension)):
+                os.remove(self._path(key, extension))
+
+        meta = {
+            "file": abspath(reader.file),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "digest": reader.digest(),
+            "format": data_format,
+        }
+        self._write_meta(self._path(key, "json"), meta)
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        Remove the least recently used entries until the cache fits its size limit
+        """
+        entries = {}
+        for name in os.listdir(self.directory):
+            key = name.split(".", 1)[0]
+            path = join(self.directory, name)
+            stat = os.stat(path)
+            size, last_used = entries.get(key, (0, 0))
+            if name.endswith(".json"):
+                last_used = stat.st_mtime_ns
+            entries[key] = (size + stat.st_size, last_used)
+
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda x: x[1][1]):
+            if total <= self.size_limit:
+                break
+            if key == keep:
+                continue
+            for extension in ("json", "npy", "pickle"):
+                if isfile(self._path(key, extension)):
+                    os.remove(self._path(key, extension))
+            total -= size
+
+    def _load(self, key: str, data_format: str) -> Any:
+        if data_format == "npy":
+            import numpy as np
+
+            return np.load(self._path(key, "npy"), allow_pickle=False)
+        with open(self._path(key, "pickle"), "rb") as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _write_meta(path: str, meta: dict) -> None:
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def _is_plain_array(data: Any) -> bool:
+        if type(data).__module__ != "numpy":
+            return False
+        return getattr(data, "ndim", 0) > 0 and not data.dtype.hasobject
 
 
 class Reader:
@@ -18,10 +163,15 @@ class FileReader(Reader):
     """
     Base class for file Reader implementation
 
-    Support basic file reading
+    Support basic file reading, and streaming reading through a memory map for
+    subclasses setting `streaming = True`.
     """
 
     file = None
+    streaming = False
+    encoding = "utf-8"
+    chunk_size = 1 << 20
+    cache = ParseCache(CACHE_DIR, CACHE_SIZE_LIMIT)
 
     def __init__(self, file: str) -> None:
         assert isfile(file), f"Cannot import file {file}"
@@ -34,6 +184,133 @@ class FileReader(Reader):
         with open(self.file, "r") as f:
             return f.read()
 
+    @contextmanager
+    def _mmap(self) -> Iterator[Optional[mmap.mmap]]:
+        """
+        Memory map the file in read only mode, yield None for empty files as they
+        cannot be mapped
+        """
+        if not getsize(self.file):
+            yield None
+            return
+
+        with open(self.file, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                yield mapped
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Lazily iterate over the file lines, without line endings.
+
+        Only the current line is decoded, the rest of the file stays in the page cache.
+        """
+        with self._mmap() as mapped:
+            if mapped is None:
+                return
+            for line in iter(mapped.readline, b""):
+                if line.endswith(b"\n"):
+                    line = line[:-1]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                yield line.decode(self.encoding)
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Lazily iterate over the raw file content, by chunks of at most chunk_size
+        bytes.
+
+        :param chunk_size: Optional chunk size, defaults to the reader chunk_size
+        """
+        chunk_size = chunk_size or self.chunk_size
+        with self._mmap() as mapped:
+            if mapped is None:
+                return
+            for start in range(0, len(mapped), chunk_size):
+                yield mapped[start : start + chunk_size]
+
+    def iter_text(self, chunk_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily iterate over the decoded file content, by chunks of at most chunk_size
+        characters. Characters split between two byte chunks are decoded once whole.
+
+        :param chunk_size: Optional chunk size in bytes, defaults to the reader
+        chunk_size
+        """
+        return codecs.iterdecode(self.iter_chunks(chunk_size), self.encoding)
+
+    def digest(self) -> str:
+        """
+        Return the hash of the file content
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in self.iter_chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def code_digest(cls) -> str:
+        """
+        Return the hash of the source of every module defining the reader or one of its
+        bases, as changing any of them may change the parsed structure
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for module_name in dict.fromkeys(base.__module__ for base in cls.__mro__):
+            source = getattr(sys.modules.get(module_name), "__file__", None)
+            if source is None or not isfile(source):
+                continue
+            stat = os.stat(source)
+            key = (source, stat.st_size, stat.st_mtime_ns)
+            if key not in _SOURCE_DIGESTS:
+                with open(source, "rb") as f:
+                    _SOURCE_DIGESTS[key] = hashlib.blake2b(
+                        f.read(), digest_size=16
+                    ).hexdigest()
+            digest.update(_SOURCE_DIGESTS[key].encode())
+        return digest.hexdigest()
+
+    def cached_read(self, *args, **kwargs) -> Any:
+        """
+        Cached version of the read function, parsing is skipped if the same reader
+        already parsed the same file content with the same arguments.
+        """
+        if not CACHE_ENABLED:
+            return self.read(*args, **kwargs)
+
+        cls = type(self)
+        raw_key = repr(
+            (
+                cls.__module__,
+                cls.__qualname__,
+                self.code_digest(),
+                abspath(self.file),
+                args,
+                sorted(kwargs.items()),
+            )
+        )
+        key = hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
+
+        hit, data = self.cache.get(key, self)
+        if hit:
+            return data
+
+        data = self.read(*args, **kwargs)
+        try:
+            self.cache.put(key, self, data)
+        except OSError:
+            # A read only or full cache directory must not prevent reading
+            pass
+        return data
+
+    def lines(self) -> Iterable[str]:
+        """
+        Return the file lines, streamed if the reader opted in, read at once otherwise
+        """
+        if self.streaming:
+            return self.iter_lines()
+        return FileReader.read(self).splitlines()
+
 
 class OneColumnFileReader(FileReader):
     """
@@ -55,8 +332,7 @@ class OneColumnFileReader(FileReader):
         :param type_to_cast: Optional type casting for each line
         :param sort: Sort the list
         """
-        data = super(OneColumnFileReader, self).read()
-        split_data = [line for line in data.splitlines() if line]
+        split_data = [line for line in self.lines() if line]
         if type_to_cast is not None:
             split_data = list(map(type_to_cast, split_data))
         if sort:
@@ -0,0 +1,167 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# The cache directory is read on import
+CACHE_DIR = tempfile.mkdtemp(prefix="aoc-cache-")
+os.environ["AOC_CACHE_DIR"] = CACHE_DIR
+
+from utils import readers  # noqa: E402
+from utils.readers import FileReader, ParseCache  # noqa: E402
+
+READER_SOURCE = """
+from utils.readers import FileReader
+
+
+class VersionedReader(FileReader):
+    def read(self, *args, **kwargs):
+        return "{version}:" + super().read()
+"""
+
+
+class CountingReader(FileReader):
+    """
+    Reader counting its actual reads
+    """
+
+    reads = 0
+
+    def read(self, *args, **kwargs):
+        type(self).reads += 1
+        return super().read()
+
+
+class UnpicklableReader(CountingReader):
+    def read(self, *args, **kwargs):
+        content = super().read()
+        return lambda: content
+
+
+def load_reader_module(path: str):
+    spec = importlib.util.spec_from_file_location("versioned_reader", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.assertEqual(readers.CACHE_DIR, CACHE_DIR)
+        self.directory = tempfile.mkdtemp(dir=CACHE_DIR)
+        self.addCleanup(shutil.rmtree, self.directory)
+        cache = ParseCache(os.path.join(self.directory, "cache"), 1 << 20)
+        patches = (
+            mock.patch.object(readers, "CACHE_ENABLED", True),
+            mock.patch.object(FileReader, "cache", cache),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.cache = cache
+        CountingReader.reads = UnpicklableReader.reads = 0
+
+    def write(self, content: str, name: str = "input.txt") -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_hit(self):
+        path = self.write("abc")
+        self.assertEqual(CountingReader(path).cached_read(), "abc")
+        self.assertEqual(CountingReader(path).cached_read(), "abc")
+        self.assertEqual(CountingReader.reads, 1)
+
+    def test_size_change(self):
+        path = self.write("abc")
+        CountingReader(path).cached_read()
+        self.write("abcd")
+        self.assertEqual(CountingReader(path).cached_read(), "abcd")
+        self.assertEqual(CountingReader.reads, 2)
+
+    def test_touch(self):
+        path = self.write("abc")
+        CountingReader(path).cached_read()
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(CountingReader(path).cached_read(), "abc")
+        self.assertEqual(CountingReader.reads, 1)
+
+        # Same size, new content and mtime, the content hash tells them apart
+        self.write("xyz")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        self.assertEqual(CountingReader(path).cached_read(), "xyz")
+        self.assertEqual(CountingReader.reads, 2)
+
+    def test_reader_source_change(self):
+        path = self.write("abc")
+        source = os.path.join(self.directory, "versioned_reader.py")
+        self.addCleanup(sys.modules.pop, "versioned_reader", None)
+        for version in ("v1", "version2"):
+            with open(source, "w") as f:
+                f.write(READER_SOURCE.format(version=version))
+            module = load_reader_module(source)
+            with self.subTest(version=version):
+                self.assertEqual(
+                    module.VersionedReader(path).cached_read(), f"{version}:abc"
+                )
+
+    def test_eviction(self):
+        self.cache.size_limit = 2500
+        paths = [self.write("x" * 1000, f"input-{index}.txt") for index in range(3)]
+        for path in paths[:2]:
+            CountingReader(path).cached_read()
+        first, second = self.entry_key(paths[0]), self.entry_key(paths[1])
+
+        # The first entry is the most recently used, the second one goes first
+        for key, last_used in ((first, 2 * 10**18), (second, 10**18)):
+            meta = os.path.join(self.cache.directory, f"{key}.json")
+            os.utime(meta, ns=(last_used, last_used))
+        CountingReader(paths[2]).cached_read()
+
+        keys = self.cache_keys()
+        self.assertEqual(len(keys), 2)
+        self.assertIn(first, keys)
+        self.assertNotIn(second, keys)
+        CountingReader(paths[0]).cached_read()
+        self.assertEqual(CountingReader.reads, 3)
+        CountingReader(paths[1]).cached_read()
+        self.assertEqual(CountingReader.reads, 4)
+
+    def test_unpicklable(self):
+        path = self.write("abc")
+        self.assertEqual(UnpicklableReader(path).cached_read()(), "abc")
+        self.assertEqual(UnpicklableReader(path).cached_read()(), "abc")
+        self.assertEqual(UnpicklableReader.reads, 2)
+        self.assertEqual(self.cache_keys(), [])
+        self.assertEqual(
+            [name for name in os.listdir(self.cache.directory) if "tmp" in name], []
+        )
+
+    def cache_keys(self):
+        return sorted(
+            name[: -len(".json")]
+            for name in os.listdir(self.cache.directory)
+            if name.endswith(".json")
+        )
+
+    def entry_key(self, path: str) -> str:
+        for key in self.cache_keys():
+            meta = os.path.join(self.cache.directory, f"{key}.json")
+            with open(meta) as f:
+                if f'"{os.path.abspath(path)}"' in f.read():
+                    return key
+        raise KeyError(path)
+
+
+def tearDownModule():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()